@@ -414,21 +414,16 @@ def getVelocity(predData):
   @return  std_velocity     The standard deviation velocity from the tracked objects.
   """
 
-  velocity = []
   std_velocity = None
   max_velocity = None
 
-  for data in predData:
-    for obj in data['objects']:
-      if 'velocity' in obj:
-        magnitude = math.sqrt(obj['velocity'][0] ** 2 + \
-                                obj['velocity'][1] ** 2 + \
-                                obj['velocity'][2] ** 2)
-        velocity.append(magnitude)
-
-  if velocity:
-    std_velocity = np.std(velocity)
-    max_velocity = np.max(velocity)
+  velocity = np.array([obj['velocity'][:3] for data in predData for obj in data['objects']
+                       if 'velocity' in obj], dtype=np.float64).reshape(-1, 3)
+
+  if len(velocity):
+    magnitude = np.linalg.norm(velocity, axis=1)
+    std_velocity = np.std(magnitude)
+    max_velocity = np.max(magnitude)
 
   return max_velocity, std_velocity
 
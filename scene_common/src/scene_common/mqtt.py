@@ -170,8 +170,15 @@ class PubSub(_PubSubTopicBase):
   def unsubscribe(self, topic):
     return self.client.unsubscribe(topic)
 
-  def addCallback(self, topic, callback, qos=0):
+  def setTopicCallback(self, topic, callback):
+    """Routes messages matching topic to callback without subscribing,
+       for clients that subscribe themselves (e.g. again on every connect).
+    """
     self.client.message_callback_add(topic, self.wrapCallback(callback))
+    return
+
+  def addCallback(self, topic, callback, qos=0):
+    self.setTopicCallback(topic, callback)
     return self.subscribe(topic, qos)
 
   def removeCallback(self, topic):
@@ -3,11 +3,13 @@
 # SPDX-FileCopyrightText: (C) 2023 - 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
-import json
 import os
+import queue
+import threading
 import time
 
 import cv2
+import orjson
 
 import controller.tools.analytics.library.json_helper as json_helper
 import controller.tools.analytics.library.metrics as metrics
@@ -27,27 +29,109 @@ STD_VELOCITY_MAX = 0.36
 # equal to number of cameras that observe the detected objects at the same time
 CAMERA_OVERLAP_RATIO = 2
 
+# shortest pacing delay worth handing to time.sleep() when replaying frames
+MIN_SLEEP_SECONDS = 0.0005
+
+# detections buffered per camera ahead of the tracker
+CAMERA_QUEUE_SIZE = 8
+
 msgs = []
 
-def get_detections(tracked_data, scene, objects, jdata):
-  """! This function builds the object list for the
-  tracked data and returns it
+def get_detections(scene, objects, cam_detect):
+  """! This function builds the tracked data entry of
+  a camera frame and returns it
 
-  @param    tracked_data  The empty list of tracked data
   @param    scene         The current scene being processed
   @param    objects       The dict of detection objects
-  @param    jdata         Json data which contains detection info
-  @return   tracked_data  The filled list of tracked data
+  @param    cam_detect    Camera detection data of the processed frame
+  @return   dict          The tracked data of the frame
+  """
+  tracker = scene.tracker
+  return {
+    "cam_id": cam_detect["id"],
+    "frame": cam_detect["frame"],
+    "timestamp": cam_detect["timestamp"],
+    "objects": buildDetectionsList(
+      [obj for category in objects for obj in tracker.currentObjects(category)], None)
+  }
+
+def read_camera_detections(jfile, detections):
+  """! Producer thread body that reads the detections of one camera
+  and queues them in file order, followed by a None sentinel. An
+  exception raised while reading is queued ahead of the sentinel
+
+  @param    jfile         The Simcam reader of the camera input
+  @param    detections    Bounded queue receiving the detections
+  @return   None
+  """
+  try:
+    while True:
+      cam_detect = jfile.read(loop=False)
+      if cam_detect is None:
+        break
+      detections.put(cam_detect)
+  except Exception as e:
+    detections.put(e)
+  finally:
+    detections.put(None)
+  return
+
+def next_camera_detection(detections):
+  """! Takes the next detection of a camera queue and re-raises
+  an exception queued by its producer thread
+
+  @param    detections    Queue filled by read_camera_detections
+  @return   cam_detect    The next detection dict, None at the end of the input
   """
+  cam_detect = detections.get()
+  if isinstance(cam_detect, Exception):
+    raise cam_detect
+  return cam_detect
 
-  obj_list = []
-  for category in objects.keys():
-    curr_objects = scene.tracker.currentObjects(category)
-    for obj in curr_objects:
-      obj_list.append(obj)
+def merged_camera_detections(mgr):
+  """! Reads every camera input on its own thread and yields the
+  detections of all cameras ordered by time, as CamManager.nextFrame does
+
+  @param    mgr           The CamManager holding the camera inputs
+  @return   generator     Detection dicts in timestamp order
+  """
+  queues = []
+  for jfile in mgr.jfiles:
+    detections = queue.Queue(maxsize=CAMERA_QUEUE_SIZE)
+    threading.Thread(target=read_camera_detections, args=(jfile, detections), daemon=True).start()
+    queues.append(detections)
 
-  jdata['objects'] = buildDetectionsList(obj_list, None)
-  tracked_data.append(jdata)
+  heads = [next_camera_detection(detections) for detections in queues]
+  while True:
+    pending = [idx for idx, cam_detect in enumerate(heads) if cam_detect is not None]
+    if not pending:
+      return
+    idx = min(pending, key=lambda idx: heads[idx]['epochtime'])
+    yield heads[idx]
+    heads[idx] = next_camera_detection(queues[idx])
+
+def map_scene_points_to_metric(scene, scene_config):
+  """! Converts every sensor, region and tripwire point list of the scene
+  config that is given in pixels to meters with a single mapping call
+
+  @param    scene         The scene providing the pixel to metric mapping
+  @param    scene_config  The scene config dict, updated in place
+  @return   None
+  """
+  targets = [(info, 'map points') for info in scene_config.get('sensors', {}).values()
+             if 'map points' in info]
+  targets += [(region, 'points') for region in scene_config.get('regions', [])]
+  targets += [(tripwire, 'points') for tripwire in scene_config.get('tripwires', [])]
+  targets = [(item, key) for item, key in targets if scene.areCoordinatesInPixels(item[key])]
+  if not targets:
+    return
+
+  metric = scene.mapPixelsToMetric([pt for item, key in targets for pt in item[key]])
+  start = 0
+  for item, key in targets:
+    end = start + len(item[key])
+    item[key] = metric[start:end]
+    start = end
   return
 
 def track(params):
@@ -65,8 +149,8 @@ def track(params):
     params["input"] = [input_cam_1, input_cam_2]
   tracked_data = []
 
-  with open(params["trackerconfig"]) as f:
-    trackerConfigData = json.load(f)
+  with open(params["trackerconfig"], 'rb') as f:
+    trackerConfigData = orjson.loads(f.read())
   max_unreliable_time = trackerConfigData["max_unreliable_time_s"]
   non_measurement_time_dynamic = trackerConfigData["non_measurement_time_dynamic_s"]
   non_measurement_time_static = trackerConfigData["non_measurement_time_static_s"]
@@ -106,29 +190,22 @@ def track(params):
     time_chunking_rate_fps=time_chunking_rate_fps
   )
 
+  map_scene_points_to_metric(scene, scene_config)
+
   if 'sensors' in scene_config:
     for name in scene_config['sensors']:
       info = scene_config['sensors'][name]
-      if 'map points' in info:
-        if scene.areCoordinatesInPixels(info['map points']):
-          info['map points'] = scene.mapPixelsToMetric(info['map points'])
       camera = Camera(name, info)
       scene.cameras[name] = camera
 
   if 'regions' in scene_config:
     for region in scene_config['regions']:
-      points = region['points']
-      if scene.areCoordinatesInPixels(points):
-        region['points'] = scene.mapPixelsToMetric(points)
       region_obj = Region(region['uuid'], region['name'], {'points': region['points']})
       scene.regions[region_obj.name] = region_obj
 
   if 'tripwires' in scene_config:
     for tripwire in scene_config['tripwires']:
-      points = tripwire['points']
-      if scene.areCoordinatesInPixels(points):
-        points = scene.mapPixelsToMetric(points)
-      tripwire_obj = Tripwire(tripwire['uuid'], tripwire['name'], {'points': points})
+      tripwire_obj = Tripwire(tripwire['uuid'], tripwire['name'], {'points': tripwire['points']})
       scene.tripwires[tripwire_obj.name] = tripwire_obj
 
   scene.ref_camera_frame_rate = ref_camera_fps
@@ -138,31 +215,20 @@ def track(params):
     scene.tracker.updateObjectClasses(params['assets'])
 
   frame_interval = 1.0 / ref_camera_fps if time_chunking_enabled else 0
-  start_time = time.time()
-  frame_count = 0
+  next_deadline = time.perf_counter()
 
-  while True:
-    _, cam_detect, _ = mgr.nextFrame(scene, loop=False)
-    if not cam_detect:
-      break
+  for cam_detect in merged_camera_detections(mgr):
     objects = cam_detect["objects"]
 
     if time_chunking_enabled:
-      frame_count += 1
-      expected_time = start_time + (frame_count * frame_interval)
-      current_time = time.time()
-      sleep_time = expected_time - current_time
-      if sleep_time > 0:
-        time.sleep(sleep_time)
+      next_deadline += frame_interval
+      slack = next_deadline - time.perf_counter()
+      if slack > MIN_SLEEP_SECONDS:
+        time.sleep(slack)
 
     scene.processCameraData(cam_detect)
 
-    jdata = {
-        "cam_id": cam_detect["id"],
-        "frame": cam_detect["frame"],
-        "timestamp": cam_detect["timestamp"]
-    }
-    get_detections(tracked_data, scene, objects, jdata)
+    tracked_data.append(get_detections(scene, objects, cam_detect))
 
   scene.tracker.join()
   return tracked_data
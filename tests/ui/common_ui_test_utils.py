@@ -14,13 +14,12 @@ import functools
 import subprocess
 import numpy as np
 
-from PIL import Image
-from io import BytesIO
 from typing import Dict
 from urllib.parse import urlparse
 from pyvirtualdisplay import Display
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field, replace
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.support.ui import Select, WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from skimage.metrics import structural_similarity as ssim
@@ -47,6 +46,18 @@ DEFAULT_SENSOR_TRIANGLE_LENGTH = 800
 DEFAULT_SENSOR_TRIANGLE_UPPER_LEFT_POINT = (-400, -300)
 BROWSER_WAIT = 5
 
+# Skip the full database check when it last succeeded within this many seconds
+DB_STATUS_CACHE_SECONDS = 60
+db_status_cache = {'checked': None}
+
+# Resolves once the page has drawn the requested number of animation frames
+RENDER_FRAMES_SCRIPT = """
+  const done = arguments[arguments.length - 1];
+  let remaining = arguments[0];
+  const tick = () => (--remaining > 0) ? requestAnimationFrame(tick) : done();
+  requestAnimationFrame(tick);
+"""
+
 def check_page_login(browser, params):
   """! Logs into the Scenescape web UI.
   @param    browser                    Object wrapping the Selenium driver.
@@ -145,6 +156,14 @@ def take_screenshot(browser, element, path):
   @param    path                       Path used to save the screenshot.
   @return   screenshot                 Base64 encoded screenshot.
   """
+  ensure_screenshot_viewport(browser)
+  return element.screenshot(path)
+
+def ensure_screenshot_viewport(browser):
+  """! Enlarges the viewport if needed so element screenshots are not out of bounds.
+  @param    browser                    The browser used in the test.
+  @return   None
+  """
   #Adding viewport-adjustment snip to handle out of bounds error
   # minimum window size required: {'width': 1550, 'height': 838}
   min_viewport_width = 1920
@@ -155,7 +174,7 @@ def take_screenshot(browser, element, path):
   if viewport_width < min_viewport_width or viewport_height < min_viewport_height:
     browser.setViewportSize( min_viewport_width, min_viewport_height )
     print("Viewport size set to:", browser.execute_script("return [window.innerWidth, window.innerHeight];"))
-  return element.screenshot(path)
+  return
 
 def read_images(img_array, file_path):
   """! Function to read array of images.
@@ -1035,7 +1054,18 @@ def check_db_status(browser):
   @param    browser                    Object wrapping the Selenium driver.
   @return   bool                       Boolean representing success.
   """
-  return navigate_to_scene(browser, TEST_SCENE_NAME)
+  last_checked = db_status_cache['checked']
+  if last_checked is not None and time.monotonic() - last_checked < DB_STATUS_CACHE_SECONDS:
+    # The database answered recently, go straight to the scene page the full check ends on
+    if navigate_directly_to_page(browser, f"/{TEST_SCENE_ID}/") \
+        and browser.find_elements(By.XPATH, f"//h2[@id='scene_name' and text()='{TEST_SCENE_NAME}']"):
+      return True
+
+  db_status_cache['checked'] = None
+  found = navigate_to_scene(browser, TEST_SCENE_NAME)
+  if found:
+    db_status_cache['checked'] = time.monotonic()
+  return found
 
 def navigate_to_scene(browser, scene_name):
   """! This function navigates to the 'Scenes' page, then waits for the Scene 'scene_name'
@@ -1106,6 +1136,37 @@ def selenium_wait_for_elements(browser, search_phrase, timeout=20):
   """
   return WebDriverWait(browser, timeout).until(EC.visibility_of_element_located(search_phrase))
 
+def wait_for(browser, locator, cond=EC.element_to_be_clickable, timeout=BROWSER_WAIT):
+  """! Waits for the located element to satisfy an expected condition.
+  @param    browser                    Object wrapping the Selenium driver.
+  @param    locator                    (By, value) tuple locating the element.
+  @param    cond                       Expected condition factory taking the locator.
+  @param    timeout                    Maximum number of seconds to wait.
+  @return   WebElement                 Whatever the condition returns, usually the element.
+  """
+  return WebDriverWait(browser, timeout).until(cond(locator))
+
+def wait_for_image_change(browser, element, previous_image, comparison_threshold, timeout=BROWSER_WAIT):
+  """! Waits until the screenshot of an element is no longer similar to a previous one.
+  @param    browser                    Object wrapping the Selenium driver.
+  @param    element                    Element to take the screenshot of.
+  @param    previous_image             Earlier screenshot of the element as a numpy array.
+  @param    comparison_threshold       SSIM threshold below which the images are considered different.
+  @param    timeout                    Maximum number of seconds to wait.
+  @return   np.ndarray                 The last screenshot of the element, changed or not.
+  """
+  screenshots = []
+
+  def image_changed(driver):
+    screenshots.append(get_element_screenshot(element))
+    return get_images_similarity(previous_image, screenshots[-1]) <= comparison_threshold
+
+  try:
+    WebDriverWait(browser, timeout).until(image_changed)
+  except TimeoutException:
+    pass
+  return screenshots[-1]
+
 def create_orphan_camera(browser, camera_name, camera_id):
   """! Creates camera in a scene then deletes the scene.
   @param    browser                    Object wrapping the Selenium driver.
@@ -1173,6 +1234,10 @@ def calculate_ssim(img1, img2):
     img1 = img1[:min_height, :min_width]
     img2 = img2[:min_height, :min_width]
 
+  # Identical screenshots are common (e.g. view reset checks), skip the filter passes
+  if np.array_equal(img1, img2):
+    return 1.0
+
   # Use multi-channel SSIM to preserve color information (important for UI testing)
   if len(img1.shape) == 3:
     return ssim(img1, img2, channel_axis=2)
@@ -1299,17 +1364,34 @@ def upload_scene_file(browser, scene_name, file):
   selector_type = By.CSS_SELECTOR
   return check_filename_in_page(browser, page_path, selector_type, file)
 
+def decode_png_screenshot(png_bytes) -> np.ndarray:
+  """! Decodes PNG screenshot bytes straight into a BGR numpy array, dropping any alpha channel.
+  @param    png_bytes                  Screenshot as returned by the selenium *_as_png calls.
+  @return   np.ndarray                 Screenshot as a BGR numpy array.
+  """
+  return cv2.imdecode(np.frombuffer(png_bytes, np.uint8), cv2.IMREAD_COLOR)
+
 def get_element_screenshot(element) -> np.ndarray:
   """! Uses the selenium driver to take a screenshot of an element and returns a numpy array.
   @return   img_array slice            Screenshot as a numpy array.
   """
-  img_bytes_raw = element.screenshot_as_png
-  img_bytes = BytesIO(img_bytes_raw)
-  img = Image.open(img_bytes, formats=["PNG"])
-  img_array = np.asarray(img)
-  # drop alpha channel, bgr to rbg
-  img_array = img_array[:, :, 0:3]
-  return img_array[:, :, ::-1]
+  return decode_png_screenshot(element.screenshot_as_png)
+
+def get_elements_screenshots(browser, elements) -> list:
+  """! Takes one screenshot of the viewport and crops it to each of the elements.
+  @param    browser                    Object wrapping the Selenium driver.
+  @param    elements                   List of elements to crop from the screenshot.
+  @return   list                       Screenshot of each element as a numpy array.
+  """
+  rects, pixel_ratio = browser.execute_script(
+    "return [arguments[0].map((elem) => {"
+    "  const rect = elem.getBoundingClientRect();"
+    "  return [rect.left, rect.top, rect.right, rect.bottom];"
+    "}), window.devicePixelRatio];", elements)
+  img_array = decode_png_screenshot(browser.get_screenshot_as_png())
+  return [img_array[max(0, int(top * pixel_ratio)):max(0, int(bottom * pixel_ratio)),
+                    max(0, int(left * pixel_ratio)):max(0, int(right * pixel_ratio))]
+          for left, top, right, bottom in rects]
 
 def is_within_rectangle(bl, tr, curr_point):
   """! Determines if a point lies within a rectangle or not.
@@ -1495,13 +1577,7 @@ class InteractWithPage(ABC):
     """! Uses the selenium driver to take screenshot and returns a numpy array.
     @return   img_array slice          Screenshot as a numpy array.
     """
-    img_bytes_raw = self.browser.get_screenshot_as_png()
-    img_bytes = BytesIO(img_bytes_raw)
-    img = Image.open(img_bytes, formats=["PNG"])
-    img_array = np.asarray(img)
-    # drop alpha channel, bgr to rbg
-    img_array = img_array[:, :, 0:3]
-    return img_array[:, :, ::-1]
+    return decode_png_screenshot(self.browser.get_screenshot_as_png())
 
   def check_file_uploaded_is_on_server(self) -> bool:
     """! Check that uploaded file is on the server.
@@ -1621,6 +1697,15 @@ class InteractWith3DScene(InteractWithPage):
     time.sleep(1)
     return self.get_page_screenshot()
 
+  def wait_for_render(self, frames=2) -> None:
+    """! Waits for the 3D scene to draw new frames so that earlier DOM and view
+    changes show up in the next screenshot.
+    @param    frames                   Number of animation frames to wait for.
+    @return   None
+    """
+    self.browser.execute_async_script(RENDER_FRAMES_SCRIPT, frames)
+    return
+
   def check_3D_asset_visible(self) -> bool:
     """! Checks 3d asset visibility by checking that the expected filename is in the page source
     and that the current screenshot differs from the baseline screenshot.
@@ -1640,17 +1725,18 @@ class InteractWith3DScene(InteractWithPage):
     """! Hides the 3D scene and camera control panels.
     @return  panels_hidden_success     Boolean which is true if both panels are hidden.
     """
-    WAIT_SEC = 1
     camera_3d_controls = self.browser.find_element(By.ID, "panel-3d-controls")
     scene_3d_controls = self.browser.find_element(By.ID, "scene-controls-3d")
 
     # Hide 3d panels
     self.browser.execute_script("arguments[0].style.display = 'none';", camera_3d_controls)
     self.browser.execute_script("arguments[0].style.display = 'none';", scene_3d_controls)
-    time.sleep(WAIT_SEC)
 
     # Check if panels are hidden successfully
-    if camera_3d_controls.is_displayed() or scene_3d_controls.is_displayed():
+    try:
+      WebDriverWait(self.browser, BROWSER_WAIT).until(
+        lambda _: not camera_3d_controls.is_displayed() and not scene_3d_controls.is_displayed())
+    except TimeoutException:
       return False
 
     return True
@@ -1659,17 +1745,18 @@ class InteractWith3DScene(InteractWithPage):
     """! Unhides the 3D scene and camera control panels.
     @return   panels_displayed_success        Boolean representing success.
     """
-    WAIT_SEC = 1
     camera_3d_controls = self.browser.find_element(By.ID, "panel-3d-controls")
     scene_3d_controls = self.browser.find_element(By.ID, "scene-controls-3d")
 
     #Unhide 3d panels
-    time.sleep(WAIT_SEC)
     self.browser.execute_script("arguments[0].style.display = 'block';", camera_3d_controls)
     self.browser.execute_script("arguments[0].style.display = 'block';", scene_3d_controls)
 
     # Check if panels are unhidden successfully
-    if not camera_3d_controls.is_displayed() or not scene_3d_controls.is_displayed():
+    try:
+      WebDriverWait(self.browser, BROWSER_WAIT).until(
+        lambda _: camera_3d_controls.is_displayed() and scene_3d_controls.is_displayed())
+    except TimeoutException:
       return False
 
     return True
@@ -6,30 +6,35 @@
 import time
 import os
 
+import numpy as np
+from scipy.optimize import linear_sum_assignment
+from scipy.spatial.distance import cdist
+from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from tests.ui.browser import By
 from tests.ui import UserInterfaceTest
 from tests.ui import common
 
+POLL_FREQUENCY = 0.1
+
 def wait_for_calibration(browser, wait_time):
   """! Waits for the auto calibration to initialize.
   @param    browser                 Object wrapping the Selenium driver.
   @param    wait_time               Int seconds to wait.
   @return   autocal_button          Web Element auto calibration button.
   """
-  iter_time = 1
-  time_passed = 0
-  iterations = int(round(wait_time/iter_time))
-  for x in range(iterations):
-    autocal_button = browser.find_element(By.ID, "auto-autocalibration")
-    time.sleep(iter_time)
-    time_passed += iter_time
-    if autocal_button.is_enabled():
-      break
+  start_time = time.perf_counter()
+  autocal_button = browser.find_element(By.ID, "auto-autocalibration")
+  try:
+    WebDriverWait(browser, wait_time, poll_frequency=POLL_FREQUENCY).until(
+      lambda driver: driver.execute_script("return !arguments[0].disabled;", autocal_button))
+  except TimeoutException:
+    pass
   print()
   print("---------------------------------------------")
-  print("After {} seconds autocal enabled: {}".format(time_passed, autocal_button.is_enabled()))
+  print("After {:.1f} seconds autocal enabled: {}".format(time.perf_counter() - start_time,
+                                                          autocal_button.is_enabled()))
   print("---------------------------------------------")
   return autocal_button
 
@@ -37,21 +42,22 @@ def wait_for_image(browser, wait_time, image_id):
   """! Waits images to load.
   @param    browser                 Object wrapping the Selenium driver.
   @param    wait_time               Int seconds to wait.
+  @param    image_id                String ID of the image element.
   @return   BOOL                    True if image loaded.
   """
-  iter_time = 1
-  iterations = int(round(wait_time/iter_time))
-  for x in range(iterations):
-    cam_img = browser.find_element(By.ID, image_id)
-    if not cam_img.is_displayed(): # it means that there is no image on UI with "No camera"
-      return True
-    time.sleep(iter_time)
-  return False
+  wait = WebDriverWait(browser, wait_time, poll_frequency=POLL_FREQUENCY,
+                       ignored_exceptions=(StaleElementReferenceException,))
+  try:
+    # it means that there is no image on UI with "No camera"
+    return wait.until(lambda driver: not driver.find_element(By.ID, image_id).is_displayed())
+  except TimeoutException:
+    return False
 
 class AprilTagCalibrationTest(UserInterfaceTest):
   def __init__(self, testName, request, recordXMLAttribute):
     super().__init__(testName, request, recordXMLAttribute)
     self.sceneName = self.params['scene']
+    self.wait = None
     return
 
   def click_button_by_id(self, button_id):
@@ -59,14 +65,14 @@ class AprilTagCalibrationTest(UserInterfaceTest):
     @param    button_id    String ID of the button to click.
     @return   None.
     """
-    wait = WebDriverWait(self.browser, 10)
-    button = wait.until(EC.element_to_be_clickable((By.ID, button_id)))
+    button = self.wait.until(EC.element_to_be_clickable((By.ID, button_id)))
     button.click()
     return
 
   def assert_points_within_tolerance(self, actual_points, expected_points, tolerance=0.1):
     """! Validates that calibration points are within tolerance of expected values.
-    Order of points is not guaranteed, so points are matched by finding closest pairs.
+    Order of points is not guaranteed, so points are matched by an optimal assignment
+    minimizing the total distance between pairs.
     @param    actual_points     Dict of actual calibration points.
     @param    expected_points   Dict of expected calibration points.
     @param    tolerance         Float tolerance as percentage (0.1 = 10%).
@@ -77,38 +83,30 @@ class AprilTagCalibrationTest(UserInterfaceTest):
     assert missing_count <= 1, \
       f"Too many missing points: expected {len(expected_points)}, got {len(actual_points)}"
 
-    actual_list = list(actual_points.values())
-    expected_list = list(expected_points.values())
-
-    # Match each actual point to the closest expected point
-    used_expected_indices = set()
-    for actual_coords in actual_list:
-      # Find the closest expected point that hasn't been used yet
-      best_match_idx = None
-      best_distance = float('inf')
-
-      for idx, expected_coords in enumerate(expected_list):
-        if idx in used_expected_indices:
-          continue
-        # Calculate Euclidean distance
-        distance = ((actual_coords[0] - expected_coords[0])**2 + (actual_coords[1] - expected_coords[1])**2)**0.5
-        if distance < best_distance:
-          best_distance = distance
-          best_match_idx = idx
-
-      assert best_match_idx is not None, "Could not find a match for actual point"
-      used_expected_indices.add(best_match_idx)
-      expected_coords = expected_list[best_match_idx]
-
-      # Validate each coordinate is within tolerance
-      for i in range(2):  # x and y coordinates
-        actual = actual_coords[i]
-        expected = expected_coords[i]
-        coord_tolerance = abs(expected * tolerance)
-        assert abs(actual - expected) <= coord_tolerance, \
-          f"Point {actual_coords} coordinate[{i}]: {actual} not within {tolerance*100}% of {expected}"
-
-    print(f"✓ {len(actual_list)} calibration points validated within {tolerance*100}% tolerance")
+    actual = np.asarray(list(actual_points.values()), dtype=float).reshape(-1, 2)
+    expected = np.asarray(list(expected_points.values()), dtype=float).reshape(-1, 2)
+
+    assert len(expected) > 0 or len(actual) == 0, \
+      f"Could not find a match for {len(actual)} actual points, no points expected"
+    if len(actual) == 0:
+      print(f"✓ No calibration points to match ({len(expected)} expected)")
+      return
+
+    # Optimal one-to-one matching of actual to expected points
+    row_ind, col_ind = linear_sum_assignment(cdist(actual, expected))
+    assert len(row_ind) == len(actual), "Could not find a match for every actual point"
+
+    matched_actual = actual[row_ind]
+    matched_expected = expected[col_ind]
+    outside = np.abs(matched_actual - matched_expected) > np.abs(matched_expected * tolerance)
+    failed = np.argwhere(outside)
+    for idx, coord in failed:
+      print(f"Point {matched_actual[idx].tolist()} coordinate[{coord}]: {matched_actual[idx][coord]}"
+            f" not within {tolerance*100}% of {matched_expected[idx][coord]}")
+    assert len(failed) == 0, \
+      f"{len(np.unique(failed[:, 0]))} calibration points not within {tolerance*100}% tolerance"
+
+    print(f"✓ {len(actual)} calibration points validated within {tolerance*100}% tolerance")
     return
 
   def checkForMalfunctions(self, cam_url, scene_name, wait_time):
@@ -137,13 +135,14 @@ class AprilTagCalibrationTest(UserInterfaceTest):
     autocal_button = wait_for_calibration(self.browser, wait_time)
     assert autocal_button.is_enabled()
     self.click_button_by_id("reset_points")
-    time.sleep(wait_time)
+    self.wait.until(lambda driver: count_calibration_points(driver) == 0)
     autocal_button.click()
-    time.sleep(wait_time)
+    self.wait.until(lambda driver: count_calibration_points(driver) > 0)
+    top_save = self.browser.find_element(By.ID, "top_save")
     self.click_button_by_id("top_save")
-    time.sleep(wait_time)
+    self.wait.until(EC.staleness_of(top_save))
     self.navigateDirectlyToPage(cam_url)
-    time.sleep(wait_time)
+    self.wait.until(lambda driver: count_calibration_points(driver) > 0)
     points = get_calibration_points_from_js(self.browser, "camera")
     print("Actual points:", points)
 
@@ -164,6 +163,7 @@ class AprilTagCalibrationTest(UserInterfaceTest):
     """! Checks that a user can setup a scene with april tags. """
     MAX_WAIT_TIME = 15
     assert self.login()
+    self.wait = WebDriverWait(self.browser, MAX_WAIT_TIME, poll_frequency=POLL_FREQUENCY)
 
     cam_url = "/cam/calibrate/4"
     test_case_1 = self.checkForMalfunctions(cam_url, "Queuing", MAX_WAIT_TIME)
@@ -171,6 +171,14 @@ class AprilTagCalibrationTest(UserInterfaceTest):
     if test_case_1:
       self.exitCode = 0
 
+def count_calibration_points(browser):
+  """! Counts the calibration points currently placed on the camera canvas.
+  @param    browser                 Object wrapping the Selenium driver.
+  @return   int                     Number of camera calibration points.
+  """
+  return browser.execute_script(
+    "return Object.keys(window.camera_calibration?.camCanvas?.getCalibrationPoints() || {}).length;")
+
 def get_calibration_points_from_js(browser, canvas_type):
   """! Gets calibration points directly from JavaScript.
   @param    browser                 Object wrapping the Selenium driver.
@@ -6,6 +6,29 @@
 from tests.ui.browser import Browser, By
 import tests.ui.common_ui_test_utils as common
 
+PARAMETERS_SELECTOR = "[id^=id_intrinsics], [id^=id_distortion]"
+
+# Fills every editable parameter with initial_value + index * step in one WebDriver call
+SET_PARAMETERS_SCRIPT = f"""
+  const [initialValue, step] = arguments;
+  document.querySelectorAll("{PARAMETERS_SELECTOR}").forEach((elem, index) => {{
+    if (!elem.readOnly && !elem.disabled) {{
+      elem.value = (initialValue + index * step).toFixed(1);
+      elem.dispatchEvent(new Event("input", {{bubbles: true}}));
+      elem.dispatchEvent(new Event("change", {{bubbles: true}}));
+    }}
+  }});
+"""
+
+# Reads the value and state of every parameter in one WebDriver call
+GET_PARAMETERS_SCRIPT = f"""
+  return Array.from(document.querySelectorAll("{PARAMETERS_SELECTOR}"), (elem) => ({{
+    value: elem.value,
+    readonly: elem.readOnly,
+    disabled: elem.disabled,
+  }}));
+"""
+
 def enter_and_validate_parameters(browser, button_id, initial_value, step):
   """! Enters camera intrinsic and distortion parameters into the web UI.
   @param    browser             Object wrapping the Selenium driver.
@@ -20,15 +43,7 @@ def enter_and_validate_parameters(browser, button_id, initial_value, step):
 
   # Enter parameters
   assert common.wait_for_elements(browser, "id_intrinsics_fx", findBy=By.ID)
-  parameter_elems = browser.find_elements(By.CSS_SELECTOR, "[id^=id_intrinsics], [id^=id_distortion]")
-  value = initial_value
-  for elem in parameter_elems:
-    readonly = elem.get_attribute("readonly")
-    disabled = elem.get_attribute("disabled")
-    if not readonly and not disabled:
-      elem.clear()
-      elem.send_keys('{:.1f}'.format(value))
-    value += step
+  browser.execute_script(SET_PARAMETERS_SCRIPT, initial_value, step)
 
   print('Saving changes...')
   browser.find_element(By.ID, button_id).click()
@@ -38,13 +53,11 @@ def enter_and_validate_parameters(browser, button_id, initial_value, step):
 
   # Validate parameters
   assert common.wait_for_elements(browser, "id_intrinsics_fx", findBy=By.ID)
-  parameter_elems = browser.find_elements(By.CSS_SELECTOR, "[id^=id_intrinsics], [id^=id_distortion]")
+  parameters = browser.execute_script(GET_PARAMETERS_SCRIPT)
   value = initial_value
-  for elem in parameter_elems:
-    current_value = elem.get_attribute('value')
-    readonly = elem.get_attribute("readonly")
-    disabled = elem.get_attribute("disabled")
-    if not readonly and not disabled:
+  for parameter in parameters:
+    current_value = parameter['value']
+    if not parameter['readonly'] and not parameter['disabled']:
       print(f"Expected value: {value}, Current value: {current_value}")
       if current_value != '{:.1f}'.format(value):
         raise RuntimeError(f"Value mismatch: Expected {value}, but current {current_value}.")
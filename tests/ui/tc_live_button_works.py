@@ -3,23 +3,23 @@
 # SPDX-FileCopyrightText: (C) 2022 - 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
-import os
-import glob
-import time
 import tests.common_test_utils as tests_common
 import tests.ui.common_ui_test_utils as common
 from tests.ui.browser import By, Browser
+from selenium.webdriver.support.ui import WebDriverWait
 
 TEST_WAIT_TIME = 5
+TEST_SSIM_THRESHOLD = 0.9
 TEST_NAME = "NEX-T10434"
-WORKSPACE = os.path.join(common.TEST_MEDIA_PATH, TEST_NAME)
+IMAGE_LOADED_SCRIPT = "return arguments[0].complete && arguments[0].naturalWidth > 0;"
 
 def test_live_button(params, record_xml_attribute=None):
   """! Test for functionality of the 'live-view' button for cameras.
   Takes screenshot of the camera1 element for baseline, then enables live-view
-  and takes a second screenshot. Waits for some time (TEST_WAIT_TIME) and
-  takes a final screenshot. Compares all three to ensure the
-  image contents in the element are changing.
+  and takes a second screenshot once the image changes. Waits up to
+  TEST_WAIT_TIME for the image to change again and takes a final screenshot.
+  Compares all three in memory to ensure the image contents in the element
+  are changing.
   @param    params                Dict of test parameters.
   @param    record_xml_attribute  Pytest fixture recording the test name.
   @return   exit_code             0 for successful test, 1 otherwise.
@@ -27,18 +27,6 @@ def test_live_button(params, record_xml_attribute=None):
   if record_xml_attribute is not None:
     record_xml_attribute("name", TEST_NAME)
 
-  image_array = []
-  files_path = glob.iglob(os.path.join(WORKSPACE, "*.png"))
-  img1_path = os.path.join(WORKSPACE, "img_1.png")
-  img2_path = os.path.join(WORKSPACE, "img_2.png")
-  img3_path = os.path.join(WORKSPACE, "img_3.png")
-
-  if not os.path.exists(WORKSPACE):
-    os.mkdir(WORKSPACE)
-  else:
-    for files in os.listdir(WORKSPACE):
-      os.remove(os.path.join(WORKSPACE, files))
-
   exit_code = 1
   try:
     print("Executing: " + TEST_NAME)
@@ -52,39 +40,30 @@ def test_live_button(params, record_xml_attribute=None):
     if live_toggle.is_selected():
       raise Exception("Live View is initially on. Expected to be off")
 
-    time.sleep(TEST_WAIT_TIME)
+    WebDriverWait(browser, TEST_WAIT_TIME).until(
+      lambda driver: driver.execute_script(IMAGE_LOADED_SCRIPT, camera1_box))
 
-    assert common.take_screenshot(browser, camera1_box, img1_path)
+    common.ensure_screenshot_viewport(browser)
+    img_1 = common.get_element_screenshot(camera1_box)
     print("Screenshot taken BEFORE enabling 'Live View' button")
 
     #enable "Live View" toggle
     browser.execute_script("arguments[0].click();", live_toggle)
     print("Clicked on 'Live View'")
 
-    time.sleep(TEST_WAIT_TIME)
-
-    assert common.take_screenshot(browser, camera1_box, img2_path)
+    img_2 = common.wait_for_image_change(browser, camera1_box, img_1, TEST_SSIM_THRESHOLD, TEST_WAIT_TIME)
     print("Screenshot taken AFTER enabling 'Live View' button")
 
-    time.sleep(TEST_WAIT_TIME)
-
-    assert common.take_screenshot(browser, camera1_box, img3_path)
+    img_3 = common.wait_for_image_change(browser, camera1_box, img_2, TEST_SSIM_THRESHOLD, TEST_WAIT_TIME)
     print("Screenshot taken AFTER waiting for some time")
 
-    assert common.read_images(image_array, files_path)
-    assert len(image_array) == 3
-    assert not common.are_images_similar(image_array[0], image_array[1], 0.9)
+    assert not common.are_images_similar(img_1, img_2, TEST_SSIM_THRESHOLD)
     print("img_1 and img_2 not equals")
-    assert not common.are_images_similar(image_array[1], image_array[2], 0.9)
+    assert not common.are_images_similar(img_2, img_3, TEST_SSIM_THRESHOLD)
     print("img_2 and img_3 not equals")
 
     exit_code = 0
 
-    # Delete the images
-    os.remove( img1_path )
-    os.remove( img2_path )
-    os.remove( img3_path )
-
   finally:
     browser.close()
     tests_common.record_test_result(TEST_NAME, exit_code)
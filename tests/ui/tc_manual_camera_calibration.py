@@ -4,19 +4,67 @@
 # SPDX-License-Identifier: Apache-2.0
 
 from scene_common import log
-import time
 from tests.ui.browser import Browser, By
 import tests.ui.common_ui_test_utils as common
 
 import numpy as np
 
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
 
 TEST_WAIT_TIME = 5
 TEST_NAME = "NEX-T10426"
 TEST_SSIM_THRESHOLD = 0.98 # 98% similarity
 
+CALIBRATION_READY_SCRIPT = """
+  const calibration = window.camera_calibration;
+  return document.readyState === "complete"
+    && Object.keys(calibration?.viewport?.getCalibrationPoints() || {}).length > 0
+    && !!calibration?.camCanvas?.image?.complete
+    && calibration.camCanvas.image.naturalWidth > 0;
+"""
+
+def wait_for_calibration_page(browser):
+  """! Waits until the camera calibration page has loaded the camera image and
+  the calibration points of the map viewport.
+  @param    browser                 Object wrapping the Selenium driver.
+  @return   None
+  """
+  WebDriverWait(browser, TEST_WAIT_TIME).until(
+    lambda driver: driver.execute_script(CALIBRATION_READY_SCRIPT))
+  return
+
+def navigate_if_needed(browser, page_path):
+  """! Navigates to a page via a URL unless the browser is already on it.
+  @param    browser                 Object wrapping the Selenium driver.
+  @param    page_path               Expected path of the page.
+  @return   bool                    Boolean representing success.
+  """
+  if common.check_current_address(browser, page_path):
+    return True
+  return common.navigate_directly_to_page(browser, page_path)
+
+def get_calibration_screenshots(browser):
+  """! Captures the camera view and the map view from a single page screenshot.
+  @param    browser                 Object wrapping the Selenium driver.
+  @return   tuple                   Camera view and map view screenshots as numpy arrays.
+  """
+  camera_view = browser.find_element(By.ID, 'camera_img_canvas')
+  map_view = browser.find_element(By.ID, 'map_canvas_3D')
+  return tuple(common.get_elements_screenshots(browser, [camera_view, map_view]))
+
+def images_differ(img1, img2):
+  """! Checks whether two images differ, comparing a small corner patch
+  before falling back to a full comparison.
+  @param    img1                    First image as a numpy array.
+  @param    img2                    Second image as a numpy array.
+  @return   bool                    True if the images are not identical.
+  """
+  if img1.shape != img2.shape:
+    return True
+  if img1[:4, :4].tobytes() != img2[:4, :4].tobytes():
+    return True
+  return not np.array_equal(img1, img2)
+
 @common.mock_display
 def test_manual_camera_calibration(params, record_xml_attribute):
   """! Checks that the camera calibration can be set manually and saved.
@@ -34,9 +82,9 @@ def test_manual_camera_calibration(params, record_xml_attribute):
     assert common.check_page_login(browser, params)
     assert common.check_db_status(browser)
 
-    common.navigate_directly_to_page(browser, f"/{common.TEST_SCENE_ID}/")
+    navigate_if_needed(browser, f"/{common.TEST_SCENE_ID}/")
     browser.find_element(By.ID, 'cam_calibrate_1').click()
-    time.sleep(TEST_WAIT_TIME)
+    wait_for_calibration_page(browser)
 
     viewport_dimensions = browser.execute_script("return [window.innerWidth, window.innerHeight];")
 
@@ -69,12 +117,9 @@ def test_manual_camera_calibration(params, record_xml_attribute):
     initial_cam_x = cam_values_init[0][0]
     initial_map_x = map_values_init[0][0]
     log.info("Take_screenshot before manual calibration")
-    camera_view_before = browser.find_element(By.ID, 'camera_img_canvas')
-    map_view_before = browser.find_element(By.ID, 'map_canvas_3D')
-    cam_pic_before = common.get_element_screenshot(camera_view_before)
-    map_pic_before = common.get_element_screenshot(map_view_before)
+    cam_pic_before, map_pic_before = get_calibration_screenshots(browser)
     log.info("Screenshot taken before manual calibration")
-    common.navigate_directly_to_page(browser, f"/{common.TEST_SCENE_ID}/")
+    navigate_if_needed(browser, f"/{common.TEST_SCENE_ID}/")
 
     log.info("Change calibration settings")
     assert common.change_cam_calibration(browser, initial_cam_x * 2, initial_map_x * 10)
@@ -82,17 +127,14 @@ def test_manual_camera_calibration(params, record_xml_attribute):
     assert common.check_cam_calibration(browser, cam_values_init[0], map_values_init[0])
     log.info("Calibration Saved")
 
-    common.navigate_directly_to_page(browser, f"/{common.TEST_SCENE_ID}/")
+    navigate_if_needed(browser, f"/{common.TEST_SCENE_ID}/")
     browser.find_element(By.ID, 'cam_calibrate_1').click()
-    time.sleep(TEST_WAIT_TIME)
+    wait_for_calibration_page(browser)
 
     log.info("Take_screenshot after saving manual calibration")
-    camera_view_after = browser.find_element(By.ID, 'camera_img_canvas')
-    map_view_after = browser.find_element(By.ID, 'map_canvas_3D')
-    cam_pic_after = common.get_element_screenshot(camera_view_after)
-    map_pic_after = common.get_element_screenshot(map_view_after)
+    cam_pic_after, map_pic_after = get_calibration_screenshots(browser)
     log.info("Screenshot taken after saving manual calibration")
-    common.navigate_directly_to_page(browser, f"/{common.TEST_SCENE_ID}/")
+    navigate_if_needed(browser, f"/{common.TEST_SCENE_ID}/")
 
     log.info("Revert to initial calibration settings")
     assert common.change_cam_calibration(browser, initial_cam_x, initial_map_x)
@@ -100,22 +142,19 @@ def test_manual_camera_calibration(params, record_xml_attribute):
     assert common.check_calibration_initialization(browser, [cam_values_init[0]], [map_values_init[0]])
     log.info("Calibration Saved")
 
-    common.navigate_directly_to_page(browser, f"/{common.TEST_SCENE_ID}/")
+    navigate_if_needed(browser, f"/{common.TEST_SCENE_ID}/")
     browser.find_element(By.ID, 'cam_calibrate_1').click()
-    time.sleep(TEST_WAIT_TIME)
+    wait_for_calibration_page(browser)
 
     log.info("Take_screenshot after reverting to the previous calibration settings")
-    camera_view_after = browser.find_element(By.ID, 'camera_img_canvas')
-    map_view_after = browser.find_element(By.ID, 'map_canvas_3D')
-    cam_pic_after_revert = common.get_element_screenshot(camera_view_after)
-    map_pic_after_revert = common.get_element_screenshot(map_view_after)
+    cam_pic_after_revert, map_pic_after_revert = get_calibration_screenshots(browser)
     log.info("Screenshot taken after reverting to the previous calibration setting")
 
     log.info("Validating of difference in screenshots after calibration")
 
-    assert not np.array_equal(cam_pic_before, cam_pic_after), \
+    assert images_differ(cam_pic_before, cam_pic_after), \
     "Expected camera images to be different, but they are the same"
-    assert not np.array_equal(map_pic_before, map_pic_after), \
+    assert images_differ(map_pic_before, map_pic_after), \
     "Expected map images to be different, but they are the same"
 
     cropped_cam_before, cropped_cam_after_revert = common.crop_to_common_shape(cam_pic_before, cam_pic_after_revert)
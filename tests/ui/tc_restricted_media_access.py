@@ -4,8 +4,9 @@
 # SPDX-License-Identifier: Apache-2.0
 
 import os
+import requests
+from http import HTTPStatus
 from tests.ui import UserInterfaceTest
-from selenium.common.exceptions import WebDriverException
 
 TEST_NAME = "NEX-T10494"
 MEDIA_PATH = "media/HazardZoneSceneLarge.png"
@@ -13,12 +14,14 @@ MEDIA_PATH = "media/HazardZoneSceneLarge.png"
 class WillOurShipGo(UserInterfaceTest):
   def navigateAndCheck(self, path=MEDIA_PATH, expect_unauthorized=False):
     url = f"{self.params['weburl']}/{path}"
-    print(f"Navigating to: {url}")
+    print(f"Requesting: {url}")
 
+    # Only the login needs a rendered page, the media check is a plain GET with the browser's session
+    session = requests.Session()
+    session.cookies.update({cookie['name']: cookie['value'] for cookie in self.browser.get_cookies()})
     try:
-      self.browser.get(url)
-      text = "401 Unauthorized"
-      got_unauthorized = text in self.browser.page_source
+      reply = session.get(url, verify=self.params['rootcert'], allow_redirects=False)
+      got_unauthorized = reply.status_code == HTTPStatus.UNAUTHORIZED
 
       if expect_unauthorized:
         print(f"Expected: 401 Unauthorized | Got: {'401 Unauthorized' if got_unauthorized else 'Accessible'}")
@@ -26,9 +29,11 @@ class WillOurShipGo(UserInterfaceTest):
       else:
         print(f"Expected: Accessible | Got: {'Accessible' if not got_unauthorized else '401 Unauthorized'}")
         return not got_unauthorized
-    except WebDriverException as e:
-      print(f"Navigation failed: {e}")
+    except requests.exceptions.RequestException as e:
+      print(f"Request failed: {e}")
       return False
+    finally:
+      session.close()
 
   def checkForMalfunctions(self):
     if self.testName and self.recordXMLAttribute:
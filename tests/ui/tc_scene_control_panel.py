@@ -3,11 +3,13 @@
 # SPDX-FileCopyrightText: (C) 2023 - 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
-import time
 from scene_common import log
 import tests.ui.common_ui_test_utils as common
 from tests.ui.browser import By, Browser
 
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+
 @common.mock_display
 def test_scene_control_panel(params, record_xml_attribute):
   """! Test the Scene Control Panel in the 3D UI.
@@ -19,7 +21,7 @@ def test_scene_control_panel(params, record_xml_attribute):
   record_xml_attribute("name", TEST_NAME)
   exit_code = 1
 
-  WAIT_SEC = 1
+  WAIT_SEC = common.BROWSER_WAIT
 
   try:
     log.info("Executing: " + TEST_NAME)
@@ -33,175 +35,151 @@ def test_scene_control_panel(params, record_xml_attribute):
     common.navigate_directly_to_page(browser, f"/scene/detail/{common.TEST_SCENE_ID}/")
 
     log.info("Turn off tracked objects and hide stats graph.")
-    time.sleep(WAIT_SEC)
     common.selenium_wait_for_elements(browser, (By.ID, "camera1-control-panel"), 100)
-    browser.find_element(By.ID, "tracked-objects-button").click()
+    common.wait_for(browser, (By.ID, "tracked-objects-button"), timeout=WAIT_SEC).click()
     interaction_page.hide_stats()
 
+    # The control panel is not re-rendered while on this page, so look its elements up once
+    card_title = browser.find_element(By.CLASS_NAME, "card-title")
+    plane_view = browser.find_element(By.ID, "plane-view-label")
+    reset = browser.find_element(By.ID, "reset")
+    button_2d = browser.find_element(By.ID, "2d-button")
+    button_3d = browser.find_element(By.ID, "3d-button")
+
     log.info("Hide 3D panels.")
-    time.sleep(WAIT_SEC)
     interaction_page.hide_control_panels()
 
     log.info("Take first floor plane screenshot.")
-    time.sleep(WAIT_SEC)
+    interaction_page.wait_for_render()
     plane_view_1 = interaction_page.get_page_screenshot()
 
     log.info("Unhide 3D panels.")
-    time.sleep(WAIT_SEC)
     interaction_page.unhide_control_panels()
 
     log.info("Toggle floor plane off.")
-    time.sleep(WAIT_SEC)
-    browser.find_element(By.ID, 'plane-view-label').click()
+    plane_view.click()
 
     log.info("Hide 3D panels.")
-    time.sleep(WAIT_SEC)
     interaction_page.hide_control_panels()
 
     log.info("Take second floor plane screenshot.")
-    time.sleep(WAIT_SEC)
+    interaction_page.wait_for_render()
     plane_view_2 = interaction_page.get_page_screenshot()
 
     log.info("AC(1) Check if floor plane screenshots are different.")
     assert not common.are_images_similar(plane_view_1, plane_view_2, 0.7)
 
     log.info("Unhide 3D panels.")
-    time.sleep(WAIT_SEC)
     interaction_page.unhide_control_panels()
 
     log.info("Toggle floor plane on.")
-    time.sleep(WAIT_SEC)
-    plane_view = browser.find_element(By.ID, "plane-view-label")
-    card_title = browser.find_element(By.CLASS_NAME, "card-title")
     action = browser.actionChains()
     action.click(plane_view).click(card_title).click(card_title).perform()
 
     log.info("Hide 3D panels.")
-    time.sleep(WAIT_SEC)
     interaction_page.hide_control_panels()
 
     log.info("Take first 3D screenshot.")
-    time.sleep(WAIT_SEC)
+    interaction_page.wait_for_render()
     screen_3d_1 = interaction_page.get_page_screenshot()
 
     log.info("AC(1) Check if floor plane screenshot is identical after toggling back on.")
     assert common.are_images_similar(plane_view_1, screen_3d_1)
 
     log.info("Unhide 3D panels.")
-    time.sleep(WAIT_SEC)
     interaction_page.unhide_control_panels()
 
     log.info("Change map perspective.")
-    time.sleep(WAIT_SEC)
     common.change_map_perspective(browser)
 
     log.info("Hide 3D panels.")
-    time.sleep(WAIT_SEC)
     interaction_page.hide_control_panels()
 
     log.info("Take second 3D screenshot.")
-    time.sleep(WAIT_SEC)
+    interaction_page.wait_for_render()
     screen_3d_2 = interaction_page.get_page_screenshot()
 
     log.info("AC(4) Check if 3D screenshots are different.")
     assert not common.are_images_similar(screen_3d_1, screen_3d_2)
 
     log.info("Unhide 3D panels.")
-    time.sleep(WAIT_SEC)
     interaction_page.unhide_control_panels()
 
     log.info("Reset 3D view.")
-    reset = browser.find_element(By.ID, "reset")
-    card_title = browser.find_element(By.CLASS_NAME, "card-title")
     action = browser.actionChains()
     action.click(reset).move_to_element(card_title).perform()
 
     log.info("Hide 3D panels.")
-    time.sleep(WAIT_SEC)
     interaction_page.hide_control_panels()
 
     log.info("Take third 3D screenshot.")
-    time.sleep(WAIT_SEC)
+    interaction_page.wait_for_render()
     screen_3d_3 = interaction_page.get_page_screenshot()
 
     log.info("AC(5) Check if 3D screenshots are identical.")
     assert common.are_images_similar(screen_3d_1, screen_3d_3)
 
     log.info("Unhide 3D panels.")
-    time.sleep(WAIT_SEC)
     interaction_page.unhide_control_panels()
 
     log.info("Click 2D view.")
-    button_2d = browser.find_element(By.ID, "2d-button")
-    card_title = browser.find_element(By.CLASS_NAME, "card-title")
     action = browser.actionChains()
     action.click(button_2d).move_to_element(card_title).perform()
 
     log.info("Take first 2D screenshot.")
-    time.sleep(WAIT_SEC)
+    interaction_page.wait_for_render()
     screen_2d_1 = interaction_page.get_page_screenshot()
 
     log.info("Change map perspective.")
-    time.sleep(WAIT_SEC)
     common.change_map_perspective(browser)
 
     log.info("Take second 2D screenshot.")
-    time.sleep(WAIT_SEC)
+    interaction_page.wait_for_render()
     screen_2d_2 = interaction_page.get_page_screenshot()
 
     log.info("AC(3) Check if 2D screenshots are identical.")
     assert common.are_images_similar(screen_2d_1, screen_2d_2)
 
     log.info("Click 3D view.")
-    button_3d = browser.find_element(By.ID, "3d-button")
-    card_title = browser.find_element(By.CLASS_NAME, "card-title")
     action = browser.actionChains()
     action.click(button_3d).move_to_element(card_title).perform()
 
     log.info("Hide 3D panels.")
-    time.sleep(WAIT_SEC)
     interaction_page.hide_control_panels()
 
     log.info("Take first 2D/3D screenshot.")
-    time.sleep(WAIT_SEC)
+    interaction_page.wait_for_render()
     screen_2d_3d_1 = interaction_page.get_page_screenshot()
 
     log.info("Change map perspective.")
-    time.sleep(WAIT_SEC)
     common.change_map_perspective(browser)
 
     log.info("Unhide 3D panels.")
-    time.sleep(WAIT_SEC)
     interaction_page.unhide_control_panels()
 
     log.info("Click 2D view.")
-    time.sleep(WAIT_SEC)
-    button_2d = browser.find_element(By.ID, "2d-button")
-    card_title = browser.find_element(By.CLASS_NAME, "card-title")
     action = browser.actionChains()
     action.click(button_2d).move_to_element(card_title).perform()
 
     log.info("Hide 3D panels.")
-    time.sleep(WAIT_SEC)
     interaction_page.hide_control_panels()
 
     log.info("Take second 2D/3D screenshot.")
-    time.sleep(WAIT_SEC)
-
+    interaction_page.wait_for_render()
     screen_2d_3d_2 = interaction_page.get_page_screenshot()
 
     log.info("AC(3) Check if 2D and 3D screenshots are similar (2D perspective is slightly different).")
     assert common.are_images_similar(screen_2d_3d_1, screen_2d_3d_2, 0.8)
 
     log.info("Unhide 3D panels.")
-    time.sleep(WAIT_SEC)
     interaction_page.unhide_control_panels()
 
     log.info("Navigate to scene details.")
+    scene_url = browser.current_url
     browser.find_element(By.ID, "scene-detail-button").click()
 
     log.info("AC(2) Check if URL has changed to scene details.")
-    time.sleep(WAIT_SEC)
+    WebDriverWait(browser, WAIT_SEC).until(EC.url_changes(scene_url))
     assert browser.current_url.split("/")[-2] == common.TEST_SCENE_ID
 
     exit_code = 0
@@ -12,7 +12,8 @@
 #   * web (REST)
 
 import os
-import time
+import copy
+import concurrent.futures
 import zipfile
 import json
 import pytest
@@ -24,12 +25,14 @@ from scene_common.rest_client import RESTClient
 
 import tests.ui.common_ui_test_utils as common
 from tests.ui import UserInterfaceTest
+from tests.ui.browser import Browser
 
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 
 MAX_CONTROLLER_WAIT = 30  # seconds
+MAX_REST_WORKERS = 16
 TEST_WAIT_TIME = 10
 TEST_NAME = "NEX-T13051"
 
@@ -39,9 +42,19 @@ INVALID_ZIP = '2'
 SCENE_EXISTS = '3'
 ORPHANED_CAMERA = '4'
 
+CAMERA_READY_TOPIC = PubSub.formatTopic(PubSub.DATA_CAMERA, camera_id="+")
+TAB_NAMES = ('cameras', 'tripwires', 'regions', 'sensors', 'children')
+TAB_COUNT_PATTERN = re.compile(r'\((\d+)\)')
+TAB_TEXTS_SCRIPT = "return arguments[0].map(name => document.getElementById(name + '-tab')?.textContent);"
+
+# Parsed scene JSON keyed by zip path, shared across the parametrized cases
+scene_data_cache = {}
+# Readiness topics already received, the services stay up between cases
+ready_topics = set()
+
 class SceneImportTest(UserInterfaceTest):
-  def __init__(self, testName, request, recordXMLAttribute, zipFile, expected, waitTime):
-    super().__init__(testName, request, recordXMLAttribute)
+  def __init__(self, testName, request, recordXMLAttribute, zipFile, expected, waitTime, browser=None):
+    super().__init__(testName, request, recordXMLAttribute, browser)
     self.sceneName = self.params['scene']
     self.sceneUID = self.params['scene_id']
     self.waitTime = waitTime
@@ -76,113 +89,198 @@ class SceneImportTest(UserInterfaceTest):
     self.pubsub.loopStart()
     return
 
+  def login(self):
+    # The browser is shared between cases, so it may still hold the session of an earlier one
+    self.browser.get(self.params['weburl'])
+    if not self.browser.find_elements(self.By.ID, "username"):
+      return True
+    return super().login()
+
   def createEmptyZip(self):
     self.zipFile = os.path.join(common.TEST_MEDIA_PATH, "Empty.zip")
     with zipfile.ZipFile(self.zipFile, 'w') as zf:
       pass
     return
 
-  def getThingTabCount(self, thing):
-    count = 0
-    if thing == 'children':
-      children_element = self.findElement(self.By.ID, "children-tab")
-      text = children_element.text
-      match = re.search(r'\((\d+)\)', text)
-      if match:
-        count = int(match.group(1))
-    else:
-      count_element = self.findElement(self.By.CSS_SELECTOR, f"#{thing}-tab .show-count")
-      count_text = count_element.text.strip("()")
-      count = int(count_text)
-    return count
+  def getThingTabCounts(self):
+    """! Reads the item counts shown on all scene detail tabs in one round trip.
+    @return   dict                     Count per tab name, None if the tab shows no count.
+    """
+    tabTexts = self.executeScript(TAB_TEXTS_SCRIPT, list(TAB_NAMES))
+    counts = {}
+    for thing, text in zip(TAB_NAMES, tabTexts):
+      match = TAB_COUNT_PATTERN.search(text or "")
+      counts[thing] = int(match.group(1)) if match else None
+    return counts
 
   def importScene(self):
-    importSceneButton = self.findElement(self.By.ID, "import-scene")
-    importSceneButton.click()
-    time.sleep(self.waitTime)
-    self.findElement(self.By.ID, "id_zipFile").send_keys(self.zipFile)
-    errors_list = self.findElement(self.By.ID, "global-error-list")
+    WebDriverWait(self.browser, self.waitTime).until(
+      EC.element_to_be_clickable((self.By.ID, "import-scene"))).click()
+    WebDriverWait(self.browser, self.waitTime).until(
+      EC.presence_of_element_located((self.By.ID, "id_zipFile"))).send_keys(self.zipFile)
     importButton = self.findElement(self.By.ID, "scene-import")
     importButton.click()
+    return importButton
+
+  def waitForImport(self, importButton):
+    """! Waits until the import either reported an error or left the import page.
+    @param    importButton             Import button clicked by importScene().
+    @return   None
+    """
+    importDone = EC.staleness_of(importButton)
+    try:
+      WebDriverWait(self.browser, self.waitTime).until(
+        lambda driver: importDone(driver) \
+          or bool(driver.find_element(self.By.ID, "global-error-list").text.strip()))
+    except TimeoutException:
+      print(f"Import did not finish within {self.waitTime} seconds.")
     return
 
   def readJSONFromZip(self):
-    data = None
+    # validate_scene() pops keys from the scene data, so hand out copies of the cached parse
+    if self.zipFile not in scene_data_cache:
+      data = None
+      with zipfile.ZipFile(self.zipFile, 'r') as zip_ref:
+        json_info = next((info for info in zip_ref.infolist() if info.filename.endswith('.json')), None)
+        if json_info is None:
+          print("No JSON file found inside the zip archive.")
+          return data
+        with zip_ref.open(json_info) as json_file:
+          data = json.load(json_file)
+      scene_data_cache[self.zipFile] = data
+    return copy.deepcopy(scene_data_cache[self.zipFile])
+
+  def preflightZip(self):
+    """! Checks the zip locally for the problems the import endpoint rejects.
+    @return   str                      EMPTY_ZIP or INVALID_ZIP, None if the scene JSON parses.
+    """
     with zipfile.ZipFile(self.zipFile, 'r') as zip_ref:
-      json_files = [f for f in zip_ref.namelist() if f.endswith('.json')]
-      if not json_files:
-        print("No JSON file found inside the zip archive.")
-        return data
-      with zip_ref.open(json_files[0]) as json_file:
-        data = json.load(json_file)
-    return data
+      json_info = next((info for info in zip_ref.infolist() if info.filename.endswith('.json')), None)
+      if json_info is None:
+        return EMPTY_ZIP
+      try:
+        with zip_ref.open(json_info) as json_file:
+          json.load(json_file)
+      except ValueError:
+        return INVALID_ZIP
+    return None
 
   def tolerant_dict_equivalence(self, dict1, dict2, tol=1e-9):
-    # Numeric comparison (int or float) with tolerance
-    if isinstance(dict1, Number) and isinstance(dict2, Number):
-      return float(dict1) == pytest.approx(float(dict2), abs=tol)
-
-    # Dict comparison: subset-based (dict2 keys must match in dict1)
-    if isinstance(dict1, dict) and isinstance(dict2, dict):
-      for key in dict2:
-        if key not in dict1:
-          return False
-        if not self.tolerant_dict_equivalence(dict1[key], dict2[key], tol):
+    # Walk both structures with an explicit stack, bailing out on the first mismatch
+    stack = [(dict1, dict2)]
+    while stack:
+      value1, value2 = stack.pop()
+      if value1 is value2:
+        continue
+
+      # Numeric comparison (int or float) with tolerance
+      if isinstance(value1, Number) and isinstance(value2, Number):
+        value1, value2 = float(value1), float(value2)
+        if value1 != value2 and not abs(value1 - value2) <= tol:
           return False
-      return True
 
-    # List comparison
-    if isinstance(dict1, (list, tuple)) and isinstance(dict2, (list, tuple)):
-      if len(dict1) != len(dict2):
-        return False
-      for v1, v2 in zip(dict1, dict2):
-        if not self.tolerant_dict_equivalence(v1, v2, tol):
-          return False
-      return True
+      # Dict comparison: subset-based (dict2 keys must match in dict1)
+      elif isinstance(value1, dict) and isinstance(value2, dict):
+        for key in value2:
+          if key not in value1:
+            return False
+          stack.append((value1[key], value2[key]))
 
-    # Fallback strict equality
-    return dict1 == dict2
+      # List comparison
+      elif isinstance(value1, (list, tuple)) and isinstance(value2, (list, tuple)):
+        if len(value1) != len(value2):
+          return False
+        stack.extend(zip(value1, value2))
 
-  def validate_scene(self, scene):
-    for cam in scene.get('cameras', []):
-      res = self.rest.getCamera(cam['uid'])
+      # Fallback strict equality
+      elif value1 != value2:
+        return False
+    return True
+
+  def listSceneThings(self, getter, sceneUID, key):
+    """! Lists everything of one type in a scene with a single request, keyed for local lookups.
+    @param    getter                   RESTClient list call for the type.
+    @param    sceneUID                 UID of the scene the things belong to.
+    @param    key                      Field to key the results by.
+    @return   dict                     Things keyed by `key`, None if the listing failed or is paged.
+    """
+    reply = getter({'scene': sceneUID})
+    if reply.errors or reply.get('next'):
+      return None
+    return {thing[key]: thing for thing in reply.get('results', [])}
+
+  def findThing(self, listing, name, getter):
+    """! Looks a thing up in a scene listing, asking the server by name if it isn't there.
+    @param    listing                  Result of listSceneThings(), may be None.
+    @param    name                     Name of the thing.
+    @param    getter                   RESTClient list call for the type.
+    @return   dict                     The thing, None if the server doesn't know it.
+    """
+    if listing is not None and name in listing:
+      return listing[name]
+    results = getter({'name': name}).get('results', [])
+    return results[0] if results else None
+
+  def validate_scene(self, scene, sceneUID=None):
+    cameras = scene.get('cameras', [])
+    tripwires = scene.get('tripwires', [])
+    regions = scene.get('regions', [])
+    sensors = scene.get('sensors', [])
+    children = scene.get('children', [])
+
+    # Imported scenes get new UIDs, so find the one the server assigned
+    if sceneUID is None:
+      sceneUID = self.rest.getScenes({'name': scene['name']})['results'][0]['uid']
+
+    # Fetch each type for the whole scene at once instead of one request per thing
+    with concurrent.futures.ThreadPoolExecutor(max_workers=MAX_REST_WORKERS) as pool:
+      cameraListing = pool.submit(self.listSceneThings, self.rest.getCameras, sceneUID, 'uid')
+      tripwireListing = pool.submit(self.listSceneThings, self.rest.getTripwires, sceneUID, 'name')
+      regionListing = pool.submit(self.listSceneThings, self.rest.getRegions, sceneUID, 'name')
+      sensorListing = pool.submit(self.listSceneThings, self.rest.getSensors, sceneUID, 'name')
+      childReplies = pool.map(self.rest.getScenes, [{'name': child['name']} for child in children])
+    cameraListing = cameraListing.result() or {}
+    tripwireListing = tripwireListing.result()
+    regionListing = regionListing.result()
+    sensorListing = sensorListing.result()
+
+    for cam in cameras:
+      res = cameraListing.get(cam['uid']) or self.rest.getCamera(cam['uid'])
       cam.pop('scene', None)
       cam.pop('distortion', None)
       res.pop('scene', None)
       assert self.tolerant_dict_equivalence(res, cam), f"Camera mismatch: {res} != {cam}"
 
-    for tripwire in scene.get('tripwires', []):
-      results = self.rest.getTripwires({'name': tripwire['name']}).get('results', [])
-      if not results:
+    for tripwire in tripwires:
+      res = self.findThing(tripwireListing, tripwire['name'], self.rest.getTripwires)
+      if res is None:
         raise ValueError(f"No tripwire found for tripwire {tripwire['name']}")
-      res = results[0]
       for k in ('uid', 'scene'):
         res.pop(k, None)
         tripwire.pop(k, None)
       assert self.tolerant_dict_equivalence(res, tripwire), f"Tripwire mismatch: {res} != {tripwire}"
 
-    for region in scene.get('regions', []):
-      results = self.rest.getRegions({'name': region['name']}).get('results', [])
-      if not results:
+    for region in regions:
+      res = self.findThing(regionListing, region['name'], self.rest.getRegions)
+      if res is None:
         raise ValueError(f"No region found for region {region['name']}")
-      res = results[0]
       for k in ('uid', 'scene'):
         res.pop(k, None)
         region.pop(k, None)
       assert self.tolerant_dict_equivalence(res, region), f"Region mismatch: {res} != {region}"
 
-    for sensor in scene.get('sensors', []):
-      results = self.rest.getSensors({'name': sensor['name']}).get('results', [])
-      if not results:
+    for sensor in sensors:
+      res = self.findThing(sensorListing, sensor['name'], self.rest.getSensors)
+      if res is None:
         raise ValueError(f"No sensor found for sensor {sensor['name']}")
-      res = results[0]
       for k in ('uid', 'scene'):
         res.pop(k, None)
         sensor.pop(k, None)
       assert self.tolerant_dict_equivalence(res, sensor), f"Sensor mismatch: {res} != {sensor}"
 
-    for child in scene.get('children', []):
-      results = self.rest.getScenes({'name': child['name']}).get('results', [])
+    for child, reply in zip(children, childReplies):
+      results = reply.get('results', [])
+      childUID = results[0]['uid']
       res_meta = dict(results[0])
       child_meta = dict(child)
 
@@ -200,37 +298,57 @@ class SceneImportTest(UserInterfaceTest):
         f"Child scene metadata mismatch: {res_meta} != {child_meta}"
 
       # Validate nested components recursively
-      self.validate_scene(child)
+      self.validate_scene(child, childUID)
+
+  def waitForReadyTopic(self, waitTopic):
+    """! Waits for a readiness topic unless an earlier case in this session already saw it.
+    @param    waitTopic                Topic signalling that a service is up.
+    @return   bool                     True if the topic has arrived.
+    """
+    if waitTopic not in ready_topics:
+      if not self.waitForTopic(waitTopic, MAX_CONTROLLER_WAIT):
+        return False
+      ready_topics.add(waitTopic)
+    return True
 
   def checkForMalfunctions(self):
     if self.testName and self.recordXMLAttribute:
       self.recordXMLAttribute("name", self.testName)
 
     try:
-      waitTopic = PubSub.formatTopic(PubSub.DATA_CAMERA, camera_id="+")
-      assert self.waitForTopic(waitTopic, MAX_CONTROLLER_WAIT), "Video Analytics not ready"
+      assert self.waitForReadyTopic(CAMERA_READY_TOPIC), "Video Analytics not ready"
 
       waitTopic = PubSub.formatTopic(PubSub.DATA_REGULATED, scene_id=self.sceneUID)
-      assert self.waitForTopic(waitTopic, MAX_CONTROLLER_WAIT), "Loading schema file.."
+      assert self.waitForReadyTopic(waitTopic), "Loading schema file.."
+
+      zipError = self.preflightZip()
+      if zipError is not None:
+        assert zipError == self.expected, f"{self.zipFile} fails locally with {self.errors[zipError]}"
 
       assert self.login()
-      self.importScene()
-      time.sleep(self.waitTime)
+      importButton = self.importScene()
       if self.expected == SCENE_EXISTS or self.expected == EMPTY_ZIP or self.expected == INVALID_ZIP:
         errorMessage = self.errors[self.expected]
 
         if self.expected == SCENE_EXISTS:
           errorMessage = errorMessage.format(self.sceneData['name'])
 
+        try:
+          WebDriverWait(self.browser, self.waitTime).until(
+            EC.text_to_be_present_in_element((self.By.ID, "global-error-list"), errorMessage))
+        except TimeoutException:
+          print(f"Expected error did not appear within {self.waitTime} seconds.")
+
         errors_list = self.findElement(self.By.ID, "global-error-list")
         assert errors_list
         print("Errors detected")
         print(errors_list.text.strip())
         assert errorMessage == errors_list.text.strip()
+      else:
+        self.waitForImport(importButton)
 
       if self.expected == ORPHANED_CAMERA:
         common.delete_scene(self.browser, self.sceneData['name'])
-        time.sleep(self.waitTime)
         self.importScene()
 
         popUps =  len(self.sceneData.get('cameras', [])) + len(self.sceneData.get('sensors', []))
@@ -247,10 +365,9 @@ class SceneImportTest(UserInterfaceTest):
         cameras = len(self.sceneData.get('cameras', []))
         sensors = len(self.sceneData.get('sensors', []))
         assert self.navigateToScene(self.sceneData['name'])
-        cameraCount = self.getThingTabCount("cameras")
-        sensorCount = self.getThingTabCount("sensors")
-        assert cameras == cameraCount
-        assert sensors == sensorCount
+        counts = self.getThingTabCounts()
+        assert cameras == counts['cameras']
+        assert sensors == counts['sensors']
 
       if self.expected == SUCCESS:
         print("No errors detected")
@@ -262,17 +379,12 @@ class SceneImportTest(UserInterfaceTest):
         sensors = len(self.sceneData.get('sensors', []))
         children = len(self.sceneData.get('children', []))
 
-        cameraCount = self.getThingTabCount("cameras")
-        tripwireCount = self.getThingTabCount("tripwires")
-        regionCount = self.getThingTabCount("regions")
-        sensorCount = self.getThingTabCount("sensors")
-        childrenCount = self.getThingTabCount("children")
-
-        assert cameras == cameraCount
-        assert tripwires == tripwireCount
-        assert regions == regionCount
-        assert sensors == sensorCount
-        assert children == childrenCount
+        counts = self.getThingTabCounts()
+        assert cameras == counts['cameras']
+        assert tripwires == counts['tripwires']
+        assert regions == counts['regions']
+        assert sensors == counts['sensors']
+        assert children == counts['children']
 
         self.validate_scene(self.sceneData)
 
@@ -285,6 +397,13 @@ class SceneImportTest(UserInterfaceTest):
           os.remove(self.zipFile)
     return
 
+@pytest.fixture(scope="module")
+def browser():
+  """! One browser for all the import cases, saving a Firefox start and login per case. """
+  shared_browser = Browser()
+  yield shared_browser
+  shared_browser.close()
+
 @pytest.mark.parametrize(
   "zipFile, expected, waitTime",
   [
@@ -297,8 +416,8 @@ class SceneImportTest(UserInterfaceTest):
     ("Intersection-Demo.zip", '0', TEST_WAIT_TIME * 6) #Intersection demo
   ]
 )
-def test_scene_import(request, record_xml_attribute, zipFile, expected, waitTime):
-  test = SceneImportTest(TEST_NAME, request, record_xml_attribute, zipFile, expected, waitTime)
+def test_scene_import(request, record_xml_attribute, browser, zipFile, expected, waitTime):
+  test = SceneImportTest(TEST_NAME, request, record_xml_attribute, zipFile, expected, waitTime, browser)
   test.checkForMalfunctions()
   assert test.exitCode == 0
   return
@@ -3,7 +3,6 @@
 # SPDX-FileCopyrightText: (C) 2022 - 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
-import time
 from tests.ui.browser import By, Browser
 import tests.ui.common_ui_test_utils as common
 
@@ -33,8 +32,8 @@ def test_sensor_area_main(params, record_xml_attribute):
     common.create_sensor_from_scene(browser, sensor_id, sensor_name, scene_name)
     print("Navigating to sensor edit tab ...")
     browser.find_element(By.LINK_TEXT, "Sensors").click()
-    browser.find_element(By.XPATH, "//*[text()='" + sensor_name + "']/parent::tr/td[4]/a").click()
-    get_radio = browser.find_elements(By.XPATH, "//*[@type='radio']")
+    browser.find_element(By.XPATH, f"//table/tbody/tr[td[1][text()='{sensor_name}']]/td[4]/a").click()
+    get_radio = browser.find_elements(By.CSS_SELECTOR, "form input[type='radio']")
     count_radio = len(get_radio)
     radio_list = []
     if count_radio == 3:
@@ -56,25 +55,15 @@ def test_sensor_area_main(params, record_xml_attribute):
 
 def validate_polygon_sensor_area(browser):
   browser.find_element(By.ID, "id_area_2").click()
-  svg = browser.find_element(By.ID, "svgout")
-  time.sleep(1)
+  svg = common.wait_for(browser, (By.ID, "svgout"), EC.visibility_of_element_located)
+  # Each mouseup on the canvas adds a vertex: the drag release places the start point
   action = browser.actionChains()
   action.drag_and_drop_by_offset(svg, 50, -50)
+  action.move_by_offset(70, 50).click()
+  action.move_by_offset(0, 80).click()
   action.perform()
-  action.click()
-
-  action2 = browser.actionChains()
-  action2.move_by_offset(70, 50).perform()
-  time.sleep(1)
-  action2.click()
-
-  action2.move_by_offset(0, 80).perform()
-  time.sleep(1)
-  action2.click()
-
-  action2.move_by_offset(50, -80).perform()
-  time.sleep(1)
-  action2.click()
+  WebDriverWait(browser, common.BROWSER_WAIT).until(
+    lambda driver: len(driver.find_elements(By.CSS_SELECTOR, "g.drawPoly .vertex")) == 3)
 
   polygon_list = browser.find_elements(By.TAG_NAME, "polygon")
   polygon_points = polygon_list[-1].get_attribute("points")
@@ -86,10 +75,10 @@ def validate_polygon_sensor_area(browser):
       point.click()
       print(f"POLYGON with 3 points created \n{p_list}")
       save_polygon.click()
-      time.sleep(3)
+      WebDriverWait(browser, common.BROWSER_WAIT).until(EC.staleness_of(save_polygon))
       break
 
-  verify_polygon = browser.find_elements(By.TAG_NAME, "polygon")
+  verify_polygon = common.wait_for(browser, (By.TAG_NAME, "polygon"), EC.presence_of_all_elements_located)
   verify_points = verify_polygon[-1].get_attribute("points")
   verify_list = list(map(float, verify_points.split(",")))
   assert p_list == verify_list
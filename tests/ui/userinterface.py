@@ -4,8 +4,6 @@
 import time
 
 import numpy as np
-from PIL import Image
-from io import BytesIO
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 
@@ -18,9 +16,9 @@ import tests.ui.common_ui_test_utils as common
 class UserInterfaceTest(Diagnostic):
   from selenium.webdriver.common.by import By
 
-  def __init__(self, testName, request, recordXMLAttribute):
+  def __init__(self, testName, request, recordXMLAttribute, browser=None):
     super().__init__(testName, request, recordXMLAttribute)
-    self.browser = Browser()
+    self.browser = browser if browser is not None else Browser()
     return
 
   def buildArgparser(self):
@@ -87,13 +85,7 @@ class UserInterfaceTest(Diagnostic):
     """! Uses the selenium driver to take screenshot and returns a numpy array.
     @return   img_array slice          Screenshot as a numpy array.
     """
-    img_bytes_raw = self.browser.get_screenshot_as_png()
-    img_bytes = BytesIO(img_bytes_raw)
-    img = Image.open(img_bytes, formats=["PNG"])
-    img_array = np.asarray(img)
-    # drop alpha channel, bgr to rbg
-    img_array = img_array[:, :, 0:3]
-    return img_array[:, :, ::-1]
+    return common.decode_png_screenshot(self.browser.get_screenshot_as_png())
 
   def navigateDirectlyToPage(self, pagePath):
     return common.navigate_directly_to_page(self.browser, pagePath)
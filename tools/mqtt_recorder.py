@@ -1,22 +1,31 @@
 # SPDX-FileCopyrightText: (C) 2025 Intel Corporation
 # SPDX-License-Identifier: Apache-2.0
 
+import functools
 import json
 import logging
 import os
+import queue
+import threading
 import time
 import sys
 
 from argparse import ArgumentParser, Namespace
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional, Tuple, IO, Any
+from typing import Optional, Tuple, IO, Any, Callable, List
 
 from scene_common.mqtt import PubSub
 
 # Default configuration constants
 MQTT_DEFAULT_ROOTCA = "/run/secrets/certs/scenescape-ca.pem"
 MQTT_DEFAULT_AUTH = "/run/secrets/controller.auth"
+OUTPUT_BUFFER_SIZE = 1 << 20
+# Flush recorded messages to disk after this many messages or seconds, whichever comes first
+FLUSH_EVERY_MESSAGES = 64
+FLUSH_INTERVAL_SECONDS = 0.25
+# Most queued messages the writer thread hands to a single writelines() call
+WRITE_BATCH_SIZE = 256
 
 # Configure logging
 logging.basicConfig(
@@ -26,6 +35,12 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+@functools.lru_cache(maxsize=8)
+def _load_auth_file(path: str, mtime_ns: int) -> Any:
+  """Parse an auth file, cached per path and modification time"""
+  return json.loads(Path(path).read_bytes())
+
+
 class MQTTRecorderError(Exception):
   """Custom exception for MQTT recorder errors"""
   pass
@@ -36,7 +51,7 @@ class MQTTRecorder:
   """MQTT message recorder"""
 
   def __init__(self, broker: str, topic: str, auth_file: str = MQTT_DEFAULT_AUTH,
-               rootca_file: str = MQTT_DEFAULT_ROOTCA):
+               rootca_file: str = MQTT_DEFAULT_ROOTCA, raw: bool = False, qos: int = 0):
     """Initialize the MQTT recorder.
 
     Args:
@@ -44,14 +59,19 @@ class MQTTRecorder:
       topic: MQTT topic to subscribe to
       auth_file: Path to authentication file
       rootca_file: Path to root CA certificate file
+      raw: Write payloads byte for byte instead of re-serializing the parsed JSON
+      qos: MQTT QoS level of the subscription
     """
     self.broker = broker
     self.topic = topic
     self.auth_file = auth_file
     self.rootca_file = rootca_file
+    self.raw = raw
+    self.qos = qos
     self.client: Optional[PubSub] = None
-    self.output_file: Optional[IO[str]] = None
+    self.output_file: Optional[IO[bytes]] = None
     self.message_count = 0
+    self._write_queue: Optional[queue.SimpleQueue] = None
 
     # Validate inputs
     self._validate_inputs()
@@ -62,6 +82,8 @@ class MQTTRecorder:
       raise MQTTRecorderError("Broker address is required")
     if not self.topic:
       raise MQTTRecorderError("Topic is required")
+    if self.qos not in (0, 1, 2):
+      raise MQTTRecorderError(f"Invalid QoS level: {self.qos}")
 
   def _read_auth_credentials(self) -> Tuple[str, str]:
     """Read user and password from JSON auth file.
@@ -78,8 +100,7 @@ class MQTTRecorder:
       raise MQTTRecorderError(f"Auth file not found: {self.auth_file}")
 
     try:
-      with open(auth_path, 'r', encoding='utf-8') as f:
-        auth_data = json.load(f)
+      auth_data = _load_auth_file(str(auth_path), auth_path.stat().st_mtime_ns)
 
       if 'user' not in auth_data or 'password' not in auth_data:
         raise MQTTRecorderError(
@@ -102,35 +123,93 @@ class MQTTRecorder:
     if rc == 0:
       logger.info("Connected to MQTT broker successfully")
       try:
-        mqttc.subscribe(self.topic)
-        logger.info(f"Subscribed to topic: {self.topic}")
+        mqttc.subscribe(self.topic, self.qos)
+        logger.info(f"Subscribed to topic: {self.topic} (QoS {self.qos})")
       except Exception as e:
         logger.error(f"Failed to subscribe to topic {self.topic}: {e}")
     else:
       logger.error(f"Failed to connect to MQTT broker with code: {rc}")
 
-  def _on_message(self, mqttc: PubSub, obj: Any, msg: Any) -> None:
-    """Callback for MQTT message received event"""
-    try:
-      # Decode message payload
-      message_str = msg.payload.decode("utf-8")
-      message_data = json.loads(message_str)
+  def _on_unmatched_message(self, mqttc: PubSub, obj: Any, msg: Any) -> None:
+    """Callback for messages that do not match the recorded topic"""
+    logger.debug("Ignoring message on unrecorded topic %s", msg.topic)
 
-      self.message_count += 1
-      logger.debug(f"Received message {self.message_count} on topic {msg.topic}")
+  def _make_on_message(self, output_write: Optional[Callable[[bytes], None]],
+                       counter: List[int]) -> Callable[[PubSub, Any, Any], None]:
+    """Build the MQTT message callback with its per-message dependencies bound as locals.
 
-      # Write to output file if specified
-      if self.output_file is not None:
-        json.dump(message_data, self.output_file, separators=(',', ':'))
-        self.output_file.write("\n")
-        self.output_file.flush()  # Ensure data is written immediately
+    Args:
+      output_write: Callable taking each serialized message line, or None to only count
+      counter: Single element list the callback increments for every parsed message
 
-    except UnicodeDecodeError as e:
-      logger.error(f"Failed to decode message payload as UTF-8: {e}")
-    except json.JSONDecodeError as e:
-      logger.error(f"Failed to parse message as JSON: {e}")
-    except Exception as e:
-      logger.error(f"Error processing message: {e}")
+    Returns:
+      Callback for MQTT message received event
+    """
+    loads = json.loads
+    dumps = functools.partial(json.dumps, separators=(',', ':'), ensure_ascii=False)
+    raw = self.raw
+    unicode_error = UnicodeDecodeError
+    decode_error = json.JSONDecodeError
+    debug = logger.debug if logger.isEnabledFor(logging.DEBUG) else None
+    error = logger.error
+
+    def on_message(mqttc: PubSub, obj: Any, msg: Any) -> None:
+      try:
+        # json.loads decodes the raw payload bytes itself,
+        # in raw mode the parse only validates the payload
+        message_data = loads(msg.payload)
+
+        counter[0] += 1
+        if debug is not None:
+          debug("Received message %d on topic %s", counter[0], msg.topic)
+
+        # Hand the line to the writer thread so file I/O stays off the MQTT network thread
+        if output_write is not None:
+          output_write((msg.payload if raw else dumps(message_data).encode()) + b"\n")
+
+      except unicode_error as e:
+        error("Failed to decode message payload as UTF-8: %s", e)
+      except decode_error as e:
+        error("Failed to parse message as JSON: %s", e)
+      except Exception as e:
+        error("Error processing message: %s", e)
+
+    return on_message
+
+  def _writer_loop(self, output_file: IO[bytes], write_queue: queue.SimpleQueue) -> None:
+    """Write queued message lines in batches until the None sentinel arrives"""
+    unflushed = 0
+    last_flush = time.monotonic()
+    running = True
+    while running:
+      try:
+        batch = [write_queue.get(timeout=FLUSH_INTERVAL_SECONDS)]
+      except queue.Empty:
+        batch = []
+      while batch and len(batch) < WRITE_BATCH_SIZE:
+        try:
+          batch.append(write_queue.get_nowait())
+        except queue.Empty:
+          break
+      if batch and batch[-1] is None:
+        batch.pop()
+        running = False
+
+      # Log I/O errors and keep draining the queue, a dead writer would silently stop recording
+      if batch:
+        try:
+          output_file.writelines(batch)
+          unflushed += len(batch)
+        except Exception as e:
+          logger.error("Failed to write %d messages to output file: %s", len(batch), e)
+      now = time.monotonic()
+      if unflushed and (unflushed >= FLUSH_EVERY_MESSAGES or now - last_flush > FLUSH_INTERVAL_SECONDS):
+        try:
+          output_file.flush()
+        except Exception as e:
+          logger.error("Failed to flush output file: %s", e)
+        unflushed = 0
+        last_flush = now
 
   @contextmanager
   def _output_file_context(self, output_path: Optional[str]):
@@ -144,10 +223,20 @@ class MQTTRecorder:
         output_file_path = Path(output_path)
         output_file_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(output_file_path, 'w', encoding='utf-8') as f:
+        with open(output_file_path, 'wb', buffering=OUTPUT_BUFFER_SIZE) as f:
           self.output_file = f
+          self._write_queue = queue.SimpleQueue()
+          writer = threading.Thread(target=self._writer_loop, args=(f, self._write_queue), daemon=True)
+          writer.start()
           logger.info(f"Writing messages to: {output_path}")
-          yield
+          try:
+            yield
+          finally:
+            # Let the writer drain what is queued, then write out the unflushed tail
+            self._write_queue.put(None)
+            writer.join()
+            self._write_queue = None
+            f.flush()
       except Exception as e:
         raise MQTTRecorderError(f"Failed to open output file {output_path}: {e}") from e
       finally:
@@ -179,7 +268,6 @@ class MQTTRecorder:
       # Initialize MQTT client
       self.client = PubSub(auth_string, None, self.rootca_file, self.broker)
       self.client.onConnect = self._on_connect
-      self.client.onMessage = self._on_message
 
       # Connect to broker
       logger.info(f"Connecting to MQTT broker: {self.broker}")
@@ -187,12 +275,19 @@ class MQTTRecorder:
 
       # Start recording with output file context
       with self._output_file_context(output_path):
+        counter = [self.message_count]
+        output_write = self._write_queue.put if self._write_queue is not None else None
+        # paho routes the recorded topic straight to its callback, the
+        # catch-all only sees traffic outside the topic filter
+        self.client.setTopicCallback(self.topic, self._make_on_message(output_write, counter))
+        self.client.onMessage = self._on_unmatched_message
         self.client.loopStart()
 
         try:
           time.sleep(interval)
         finally:
           self.client.loopStop()
+          self.message_count = counter[0]
 
       logger.info(f"Recording completed. Captured {self.message_count} messages")
       return self.message_count
@@ -244,6 +339,20 @@ def build_argparser() -> ArgumentParser:
     default=MQTT_DEFAULT_ROOTCA,
     help=f"Path to root CA certificate file (default: {MQTT_DEFAULT_ROOTCA})"
   )
+  parser.add_argument(
+    "--raw",
+    action="store_true",
+    help="Write message payloads exactly as received instead of re-serializing them "
+         "(payloads must be single-line JSON to keep one message per line)"
+  )
+  parser.add_argument(
+    "--qos",
+    type=int,
+    choices=(0, 1, 2),
+    default=0,
+    help="MQTT QoS level for the subscription (default: 0). QoS 0 gives the highest "
+         "throughput, QoS 1/2 add per-message acknowledgements for reliable delivery"
+  )
   parser.add_argument(
     "--verbose", "-v",
     action="store_true",
@@ -266,7 +375,9 @@ def main() -> int:
       broker=args.broker,
       topic=args.topic,
       auth_file=args.auth_file,
-      rootca_file=args.rootca_file
+      rootca_file=args.rootca_file,
+      raw=args.raw,
+      qos=args.qos
     )
 
     message_count = recorder.record(args.interval, args.output)
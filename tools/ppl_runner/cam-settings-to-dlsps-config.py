@@ -4,7 +4,6 @@
 import argparse
 import json
 import os
-import cv2
 
 from manager.ppl_generator import PipelineConfigGenerator, PipelineGenerator
 
@@ -25,9 +24,11 @@ def load_camera_settings(filepath: str) -> dict:
     'distortion_p2',
     'distortion_k3']
   for field in camera_numerical_fields:
-    if field in camera_settings:
+    value = camera_settings.get(field)
+    # json already parses decimal numbers as float, only cast ints and strings
+    if field in camera_settings and not isinstance(value, float):
       try:
-        camera_settings[field] = float(camera_settings[field])
+        camera_settings[field] = float(value)
       except ValueError:
         raise ValueError(
           f"Camera setting '{field}' must be a numerical value.")
@@ -11,14 +11,17 @@ import uuid
 import pytest
 from pathlib import Path
 from python_on_whales import DockerClient
-from waiting import wait
 
 from utils.certs import generate_test_certificates
-from utils.docker import is_tracker_ready
+from utils.docker import is_tracker_ready, reset_broker_host_cache
 
 
-@pytest.fixture(scope="function")
-def tls_certs(tmp_path):
+# Services pulled from a registry; the tracker image is built locally
+REGISTRY_SERVICES = ["broker", "otel-collector"]
+
+
+@pytest.fixture(scope="session")
+def tls_certs(tmp_path_factory):
   """
   Generate test TLS certificates in a temp directory.
 
@@ -26,28 +29,48 @@ def tls_certs(tmp_path):
   pointing to these certificate files. This fixture is shared by
   both TLS and non-TLS tests - non-TLS tests need valid files for
   Docker Compose secrets even though the certs won't be used.
+
+  Key generation is expensive, so the certificates are created once
+  per session. Fixtures write their env file as <project_name>.env
+  in temp_dir so concurrent projects never share one.
   """
-  certs = generate_test_certificates(tmp_path / "certs")
+  certs = generate_test_certificates(tmp_path_factory.mktemp("certs"))
   yield certs
-  # Cleanup handled by tmp_path fixture
+  # Cleanup handled by tmp_path_factory fixture
+
+
+@pytest.fixture(scope="session")
+def docker_images_ready():
+  """
+  Pull the registry images used by docker-compose.yaml once per session.
+
+  Later compose up calls then start containers from the local image
+  cache instead of checking the registry for every test project.
+  """
+  service_dir = Path(__file__).parent
+  docker = DockerClient(
+      compose_files=[service_dir / "docker-compose.yaml"],
+      compose_project_directory=str(service_dir),
+  )
+  docker.compose.pull(services=REGISTRY_SERVICES, quiet=True)
 
 
 @pytest.fixture(scope="function")
-def tracker_service(tls_certs):
+def tracker_service(tls_certs, docker_images_ready):
   """
   Fixture that starts tracker service with broker and OTEL collector.
 
   Used for tests that need a fully running service (e.g., shutdown tests).
 
   Yields:
-      dict: Contains 'containers' and 'docker' client
+      dict: Contains the 'tracker' container and 'docker' client
   """
   service_dir = Path(__file__).parent
   compose_file = service_dir / "docker-compose.yaml"
 
   project_name = f"tracker-test-{uuid.uuid4().hex[:8]}"
 
-  env_file = tls_certs.temp_dir / ".env"
+  env_file = tls_certs.temp_dir / f"{project_name}.env"
   env_file.write_text(
       f"TLS_CA_CERT_FILE={tls_certs.ca.cert_path}\n"
       f"TLS_SERVER_CERT_FILE={tls_certs.server.cert_path}\n"
@@ -67,31 +90,31 @@ def tracker_service(tls_certs):
     print(f"\nStarting test environment: {project_name}")
     docker.compose.up(detach=True, wait=True)
 
-    yield {"containers": docker.compose.ps(), "docker": docker}
+    yield {"tracker": docker.compose.ps(services=["tracker"])[0], "docker": docker}
 
   finally:
     print(f"\nCleaning up: {project_name}")
     docker.compose.down(remove_orphans=True, volumes=True)
 
 
-@pytest.fixture(scope="function")
-def tracker_service_delayed_broker(tls_certs):
+@pytest.fixture(scope="module")
+def tracker_compose_project(tls_certs, docker_images_ready):
   """
-  Fixture that starts services, immediately stops broker, for delayed broker testing.
+  Fixture that starts the compose project once per test module.
 
-  Used to test that tracker can connect to a broker that starts after
-  the tracker (delayed broker availability).
+  Tests sharing this project may only stop/start/restart the broker and
+  must leave it running on teardown. Tests that change the tracker
+  container itself (e.g., shutdown tests) use tracker_service instead.
 
   Yields:
-      dict: Contains 'docker' client (broker stopped after initial startup)
+      DockerClient: Client bound to the shared compose project
   """
   service_dir = Path(__file__).parent
   compose_file = service_dir / "docker-compose.yaml"
 
-  project_name = f"tracker-delayed-{uuid.uuid4().hex[:8]}"
+  project_name = f"tracker-module-{uuid.uuid4().hex[:8]}"
 
-  # Write .env file in temp directory
-  env_file = tls_certs.temp_dir / ".env"
+  env_file = tls_certs.temp_dir / f"{project_name}.env"
   env_file.write_text(
       f"TLS_CA_CERT_FILE={tls_certs.ca.cert_path}\n"
       f"TLS_SERVER_CERT_FILE={tls_certs.server.cert_path}\n"
@@ -108,24 +131,39 @@ def tracker_service_delayed_broker(tls_certs):
   )
 
   try:
-    print(f"\nStarting test environment: {project_name}")
+    print(f"\nStarting shared test environment: {project_name}")
     # Start all services (broker needed for tracker to start due to depends_on)
+    # Detached up returns once every container is created and started, so
+    # the tracker exists before tests touch the broker without polling ps
     docker.compose.up(detach=True, wait=False)
 
-    # Wait for tracker container to exist before stopping broker
-    def tracker_container_exists():
-      try:
-        containers = docker.compose.ps()
-        return any("-tracker-" in c.name for c in containers)
-      except Exception:
-        return False
+    yield docker
 
-    wait(tracker_container_exists, timeout_seconds=10, sleep_seconds=0.2)
-    print("Stopping broker to simulate delayed availability...")
-    docker.compose.stop(services=["broker"])
+  finally:
+    print(f"\nCleaning up: {project_name}")
+    docker.compose.down(remove_orphans=True, volumes=True)
+
+
+@pytest.fixture(scope="function")
+def tracker_service_delayed_broker(tracker_compose_project):
+  """
+  Fixture that stops the broker of the shared project for delayed broker testing.
+
+  Used to test that tracker can connect to a broker that starts after
+  the tracker (delayed broker availability). The broker is started again
+  on teardown so the next test in the module gets a running project.
+
+  Yields:
+      dict: Contains 'docker' client (broker stopped)
+  """
+  docker = tracker_compose_project
 
+  print("Stopping broker to simulate delayed availability...")
+  docker.compose.stop(services=["broker"])
+
+  try:
     yield {"docker": docker}
 
   finally:
-    print(f"\nCleaning up: {project_name}")
-    docker.compose.down(remove_orphans=True, volumes=True)
+    docker.compose.start(services=["broker"])
+    reset_broker_host_cache()
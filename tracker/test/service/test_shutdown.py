@@ -9,9 +9,16 @@ Graceful shutdown test for tracker service.
 Validates that the tracker service handles SIGTERM correctly.
 """
 
+import re
+
 from python_on_whales import DockerClient
 
 
+# Shutdown is the last thing the tracker logs, so the log tail is enough
+SHUTDOWN_LOG_TAIL = 200
+GRACEFUL_SHUTDOWN_PATTERN = re.compile(r"shutting down gracefully", re.IGNORECASE)
+
+
 def test_graceful_shutdown(tracker_service):
   """
   Test that tracker service shuts down gracefully on SIGTERM.
@@ -24,18 +31,10 @@ def test_graceful_shutdown(tracker_service):
   docker = DockerClient()
   context = tracker_service
 
-  # Get tracker container
-  tracker_container = None
-  for container in context["containers"]:
-    if "-tracker-" in container.name:
-      tracker_container = container
-      break
+  tracker_container = context["tracker"]
 
-  assert tracker_container is not None, "Tracker container not found"
-
-  # Verify service is running before shutdown
-  container_info = docker.container.inspect(tracker_container.id)
-  assert container_info.state.running, "Tracker should be running before shutdown test"
+  # No pre-stop inspect: tracker_service brings the project up with
+  # compose up --wait, so the tracker is already running and healthy
 
   print(f"\nSending SIGTERM to tracker (docker stop)...")
 
@@ -52,8 +51,8 @@ def test_graceful_shutdown(tracker_service):
       f"Exit code 137 means SIGKILL (timeout exceeded)."
 
   # Check logs for graceful shutdown message
-  logs = docker.container.logs(tracker_container.id)
-  assert "shutting down gracefully" in logs.lower(), \
+  logs = docker.container.logs(tracker_container.id, tail=SHUTDOWN_LOG_TAIL)
+  assert GRACEFUL_SHUTDOWN_PATTERN.search(logs), \
       f"Expected 'shutting down gracefully' in logs. Got:\n{logs[-500:]}"
 
   print(f"Tracker shut down gracefully (exit code: {exit_code})")
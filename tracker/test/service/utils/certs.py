@@ -7,26 +7,83 @@
 TLS certificate generation utilities for service tests.
 
 Generates self-signed CA, server, and client certificates for testing
-MQTT TLS connections. Uses the cryptography library.
+MQTT TLS connections with Ed25519 keys. Uses the cryptography library.
 """
 
+import ipaddress
+import itertools
+import re
 import tempfile
+import time
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import Optional
 
 from cryptography import x509
-from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ed25519
 from cryptography.x509.oid import NameOID, ExtendedKeyUsageOID
 
 
+# Serial numbers only need to be unique per issuer; a counter seeded from the
+# clock stays unique across runs without reading the OS random source per cert
+serial_numbers = itertools.count(time.time_ns())
+
+# Cheap textual test for IP literals; hex-only hostnames (e.g. "cafe") still
+# fail ip_address() and become DNS names
+IP_ADDRESS_PATTERN = re.compile(r"^[\d.:a-fA-F]+$")
+
+# Subject attributes shared by all test certificates; only OU/CN differ
+BASE_NAME_ATTRIBUTES = (
+    x509.NameAttribute(NameOID.COUNTRY_NAME, "US"),
+    x509.NameAttribute(NameOID.STATE_OR_PROVINCE_NAME, "Oregon"),
+    x509.NameAttribute(NameOID.LOCALITY_NAME, "Hillsboro"),
+    x509.NameAttribute(NameOID.ORGANIZATION_NAME, "Intel Corporation"),
+)
+CA_SUBJECT = x509.Name([
+    *BASE_NAME_ATTRIBUTES,
+    x509.NameAttribute(NameOID.ORGANIZATIONAL_UNIT_NAME, "Test CA"),
+    x509.NameAttribute(NameOID.COMMON_NAME, "Tracker Test CA"),
+])
+SERVER_SUBJECT = x509.Name([*BASE_NAME_ATTRIBUTES, x509.NameAttribute(NameOID.COMMON_NAME, "broker")])
+
+# Certificate extensions are immutable, so all certificates share them
+CA_BASIC_CONSTRAINTS = x509.BasicConstraints(ca=True, path_length=0)
+LEAF_BASIC_CONSTRAINTS = x509.BasicConstraints(ca=False, path_length=None)
+CA_KEY_USAGE = x509.KeyUsage(
+    digital_signature=True,
+    content_commitment=False,
+    key_encipherment=False,
+    data_encipherment=False,
+    key_agreement=False,
+    key_cert_sign=True,
+    crl_sign=True,
+    encipher_only=False,
+    decipher_only=False,
+)
+LEAF_KEY_USAGE = x509.KeyUsage(
+    digital_signature=True,
+    content_commitment=False,
+    key_encipherment=False,
+    data_encipherment=False,
+    key_agreement=False,
+    key_cert_sign=False,
+    crl_sign=False,
+    encipher_only=False,
+    decipher_only=False,
+)
+SERVER_EXTENDED_KEY_USAGE = x509.ExtendedKeyUsage([ExtendedKeyUsageOID.SERVER_AUTH])
+CLIENT_EXTENDED_KEY_USAGE = x509.ExtendedKeyUsage([ExtendedKeyUsageOID.CLIENT_AUTH])
+
+
 @dataclass
 class CertificateBundle:
   """Container for certificate and key file paths."""
 
   cert_path: Path
-  key_path: Path
+  # None when the key is never written (the CA key only signs in memory)
+  key_path: Optional[Path] = None
 
 
 @dataclass
@@ -39,17 +96,20 @@ class TlsTestCerts:
   temp_dir: Path
 
 
-def generate_private_key() -> rsa.RSAPrivateKey:
-  """Generate RSA private key."""
-  return rsa.generate_private_key(
-      public_exponent=65537,
-      key_size=2048,
-  )
+def generate_private_key() -> ed25519.Ed25519PrivateKey:
+  """
+  Generate Ed25519 private key.
+
+  Ed25519 keys are generated in microseconds, unlike RSA keys that need
+  a prime search, and are accepted by Mosquitto, Paho and Python ssl.
+  """
+  return ed25519.Ed25519PrivateKey.generate()
 
 
 def generate_ca_certificate(
-    ca_key: rsa.RSAPrivateKey,
+    ca_key: ed25519.Ed25519PrivateKey,
     validity_days: int = 365,
+    not_before: datetime = None,
 ) -> x509.Certificate:
   """
   Generate a self-signed CA certificate.
@@ -57,62 +117,66 @@ def generate_ca_certificate(
   Args:
       ca_key: CA private key
       validity_days: Certificate validity period
+      not_before: Start of validity (default: now, UTC)
 
   Returns:
       Self-signed CA certificate
   """
-  subject = issuer = x509.Name([
-      x509.NameAttribute(NameOID.COUNTRY_NAME, "US"),
-      x509.NameAttribute(NameOID.STATE_OR_PROVINCE_NAME, "Oregon"),
-      x509.NameAttribute(NameOID.LOCALITY_NAME, "Hillsboro"),
-      x509.NameAttribute(NameOID.ORGANIZATION_NAME, "Intel Corporation"),
-      x509.NameAttribute(NameOID.ORGANIZATIONAL_UNIT_NAME, "Test CA"),
-      x509.NameAttribute(NameOID.COMMON_NAME, "Tracker Test CA"),
-  ])
+  subject = issuer = CA_SUBJECT
 
-  now = datetime.now(timezone.utc)
+  now = not_before or datetime.now(timezone.utc)
   cert = (
       x509.CertificateBuilder()
       .subject_name(subject)
       .issuer_name(issuer)
       .public_key(ca_key.public_key())
-      .serial_number(x509.random_serial_number())
+      .serial_number(next(serial_numbers))
       .not_valid_before(now)
       .not_valid_after(now + timedelta(days=validity_days))
       .add_extension(
-          x509.BasicConstraints(ca=True, path_length=0),
+          CA_BASIC_CONSTRAINTS,
           critical=True,
       )
       .add_extension(
-          x509.KeyUsage(
-              digital_signature=True,
-              content_commitment=False,
-              key_encipherment=False,
-              data_encipherment=False,
-              key_agreement=False,
-              key_cert_sign=True,
-              crl_sign=True,
-              encipher_only=False,
-              decipher_only=False,
-          ),
+          CA_KEY_USAGE,
           critical=True,
       )
       .add_extension(
           x509.SubjectKeyIdentifier.from_public_key(ca_key.public_key()),
           critical=False,
       )
-      .sign(ca_key, hashes.SHA256())
+      # Ed25519 signs the data directly, so no digest algorithm is passed
+      .sign(ca_key, None)
   )
 
   return cert
 
 
+def subject_alt_name(hostname: str) -> x509.GeneralName:
+  """
+  Build a SAN entry for a hostname.
+
+  Args:
+      hostname: DNS name or IP address literal
+
+  Returns:
+      IPAddress entry for IP literals, DNSName entry otherwise
+  """
+  if IP_ADDRESS_PATTERN.match(hostname):
+    try:
+      return x509.IPAddress(ipaddress.ip_address(hostname))
+    except ValueError:
+      pass
+  return x509.DNSName(hostname)
+
+
 def generate_server_certificate(
-    server_key: rsa.RSAPrivateKey,
-    ca_key: rsa.RSAPrivateKey,
+    server_key: ed25519.Ed25519PrivateKey,
+    ca_key: ed25519.Ed25519PrivateKey,
     ca_cert: x509.Certificate,
     hostnames: list[str] = None,
     validity_days: int = 365,
+    not_before: datetime = None,
 ) -> x509.Certificate:
   """
   Generate a server certificate signed by the CA.
@@ -123,6 +187,7 @@ def generate_server_certificate(
       ca_cert: CA certificate
       hostnames: List of hostnames for SAN (default: localhost, broker)
       validity_days: Certificate validity period
+      not_before: Start of validity (default: now, UTC)
 
   Returns:
       Server certificate signed by CA
@@ -130,72 +195,49 @@ def generate_server_certificate(
   if hostnames is None:
     hostnames = ["localhost", "broker", "127.0.0.1"]
 
-  subject = x509.Name([
-      x509.NameAttribute(NameOID.COUNTRY_NAME, "US"),
-      x509.NameAttribute(NameOID.STATE_OR_PROVINCE_NAME, "Oregon"),
-      x509.NameAttribute(NameOID.LOCALITY_NAME, "Hillsboro"),
-      x509.NameAttribute(NameOID.ORGANIZATION_NAME, "Intel Corporation"),
-      x509.NameAttribute(NameOID.COMMON_NAME, "broker"),
-  ])
+  subject = SERVER_SUBJECT
 
   # Build SAN extension with DNS names and IP addresses
-  san_entries = []
-  for hostname in hostnames:
-    # Check if it's an IP address
-    try:
-      import ipaddress
-      ip = ipaddress.ip_address(hostname)
-      san_entries.append(x509.IPAddress(ip))
-    except ValueError:
-      san_entries.append(x509.DNSName(hostname))
+  san_entries = [subject_alt_name(hostname) for hostname in hostnames]
 
-  now = datetime.now(timezone.utc)
+  now = not_before or datetime.now(timezone.utc)
   cert = (
       x509.CertificateBuilder()
       .subject_name(subject)
       .issuer_name(ca_cert.subject)
       .public_key(server_key.public_key())
-      .serial_number(x509.random_serial_number())
+      .serial_number(next(serial_numbers))
       .not_valid_before(now)
       .not_valid_after(now + timedelta(days=validity_days))
       .add_extension(
-          x509.BasicConstraints(ca=False, path_length=None),
+          LEAF_BASIC_CONSTRAINTS,
           critical=True,
       )
       .add_extension(
-          x509.KeyUsage(
-              digital_signature=True,
-              content_commitment=False,
-              key_encipherment=True,
-              data_encipherment=False,
-              key_agreement=False,
-              key_cert_sign=False,
-              crl_sign=False,
-              encipher_only=False,
-              decipher_only=False,
-          ),
+          LEAF_KEY_USAGE,
           critical=True,
       )
       .add_extension(
-          x509.ExtendedKeyUsage([ExtendedKeyUsageOID.SERVER_AUTH]),
+          SERVER_EXTENDED_KEY_USAGE,
           critical=False,
       )
       .add_extension(
           x509.SubjectAlternativeName(san_entries),
           critical=False,
       )
-      .sign(ca_key, hashes.SHA256())
+      .sign(ca_key, None)
   )
 
   return cert
 
 
 def generate_client_certificate(
-    client_key: rsa.RSAPrivateKey,
-    ca_key: rsa.RSAPrivateKey,
+    client_key: ed25519.Ed25519PrivateKey,
+    ca_key: ed25519.Ed25519PrivateKey,
     ca_cert: x509.Certificate,
     common_name: str = "tracker-client",
     validity_days: int = 365,
+    not_before: datetime = None,
 ) -> x509.Certificate:
   """
   Generate a client certificate signed by the CA.
@@ -206,68 +248,51 @@ def generate_client_certificate(
       ca_cert: CA certificate
       common_name: Client common name
       validity_days: Certificate validity period
+      not_before: Start of validity (default: now, UTC)
 
   Returns:
       Client certificate signed by CA
   """
-  subject = x509.Name([
-      x509.NameAttribute(NameOID.COUNTRY_NAME, "US"),
-      x509.NameAttribute(NameOID.STATE_OR_PROVINCE_NAME, "Oregon"),
-      x509.NameAttribute(NameOID.LOCALITY_NAME, "Hillsboro"),
-      x509.NameAttribute(NameOID.ORGANIZATION_NAME, "Intel Corporation"),
-      x509.NameAttribute(NameOID.COMMON_NAME, common_name),
-  ])
+  subject = x509.Name([*BASE_NAME_ATTRIBUTES, x509.NameAttribute(NameOID.COMMON_NAME, common_name)])
 
-  now = datetime.now(timezone.utc)
+  now = not_before or datetime.now(timezone.utc)
   cert = (
       x509.CertificateBuilder()
       .subject_name(subject)
       .issuer_name(ca_cert.subject)
       .public_key(client_key.public_key())
-      .serial_number(x509.random_serial_number())
+      .serial_number(next(serial_numbers))
       .not_valid_before(now)
       .not_valid_after(now + timedelta(days=validity_days))
       .add_extension(
-          x509.BasicConstraints(ca=False, path_length=None),
+          LEAF_BASIC_CONSTRAINTS,
           critical=True,
       )
       .add_extension(
-          x509.KeyUsage(
-              digital_signature=True,
-              content_commitment=False,
-              key_encipherment=True,
-              data_encipherment=False,
-              key_agreement=False,
-              key_cert_sign=False,
-              crl_sign=False,
-              encipher_only=False,
-              decipher_only=False,
-          ),
+          LEAF_KEY_USAGE,
           critical=True,
       )
       .add_extension(
-          x509.ExtendedKeyUsage([ExtendedKeyUsageOID.CLIENT_AUTH]),
+          CLIENT_EXTENDED_KEY_USAGE,
           critical=False,
       )
-      .sign(ca_key, hashes.SHA256())
+      .sign(ca_key, None)
   )
 
   return cert
 
 
 def write_cert(cert: x509.Certificate, path: Path) -> None:
-  """Write certificate to PEM file."""
-  path.parent.mkdir(parents=True, exist_ok=True)
+  """Write certificate to PEM file. The parent directory must exist."""
   path.write_bytes(cert.public_bytes(serialization.Encoding.PEM))
 
 
-def write_key(key: rsa.RSAPrivateKey, path: Path) -> None:
-  """Write private key to PEM file (unencrypted)."""
-  path.parent.mkdir(parents=True, exist_ok=True)
+def write_key(key: ed25519.Ed25519PrivateKey, path: Path) -> None:
+  """Write private key to PEM file (unencrypted). The parent directory must exist."""
   path.write_bytes(
       key.private_bytes(
           encoding=serialization.Encoding.PEM,
-          format=serialization.PrivateFormat.TraditionalOpenSSL,
+          format=serialization.PrivateFormat.PKCS8,
           encryption_algorithm=serialization.NoEncryption(),
       )
   )
@@ -291,32 +316,32 @@ def generate_test_certificates(temp_dir: Path = None) -> TlsTestCerts:
   else:
     temp_dir.mkdir(parents=True, exist_ok=True)
 
-  # Generate CA
   ca_key = generate_private_key()
-  ca_cert = generate_ca_certificate(ca_key)
+  server_key = generate_private_key()
+  client_key = generate_private_key()
+  now = datetime.now(timezone.utc)
+
+  # Generate CA; peers only need its certificate, the key signs in memory
+  ca_cert = generate_ca_certificate(ca_key, not_before=now)
   ca_cert_path = temp_dir / "ca.crt"
-  ca_key_path = temp_dir / "ca.key"
   write_cert(ca_cert, ca_cert_path)
-  write_key(ca_key, ca_key_path)
 
   # Generate server certificate
-  server_key = generate_private_key()
-  server_cert = generate_server_certificate(server_key, ca_key, ca_cert)
+  server_cert = generate_server_certificate(server_key, ca_key, ca_cert, not_before=now)
   server_cert_path = temp_dir / "server.crt"
   server_key_path = temp_dir / "server.key"
   write_cert(server_cert, server_cert_path)
   write_key(server_key, server_key_path)
 
   # Generate client certificate
-  client_key = generate_private_key()
-  client_cert = generate_client_certificate(client_key, ca_key, ca_cert)
+  client_cert = generate_client_certificate(client_key, ca_key, ca_cert, not_before=now)
   client_cert_path = temp_dir / "client.crt"
   client_key_path = temp_dir / "client.key"
   write_cert(client_cert, client_cert_path)
   write_key(client_key, client_key_path)
 
   return TlsTestCerts(
-      ca=CertificateBundle(cert_path=ca_cert_path, key_path=ca_key_path),
+      ca=CertificateBundle(cert_path=ca_cert_path),
       server=CertificateBundle(cert_path=server_cert_path, key_path=server_key_path),
       client=CertificateBundle(cert_path=client_cert_path, key_path=client_key_path),
       temp_dir=temp_dir,
@@ -9,42 +9,196 @@ Test helper utilities for tracker service tests.
 Provides polling helpers for event-driven testing without fixed sleeps.
 """
 
-from waiting import wait
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+
+import requests
+from waiting import wait, TimeoutExpired
 
 
 # Default timeouts for polling
 DEFAULT_TIMEOUT = 10
 POLL_INTERVAL = 0.1
 
+# Logged once the tracker's topic subscription is acknowledged, the last
+# condition /readyz waits for (main loop updates readiness every 100ms)
+READY_LOG_LINE = b"MQTT subscription successful"
+# Lines this old are still matched, so a subscription logged just before the
+# first probe (readiness not yet updated) is not missed; an older match only
+# wakes the wait early and falls back to probing
+READY_LOG_LOOKBACK = 1.0
+
+# Container port of the tracker healthcheck server (same default as docker-compose.yaml)
+HEALTHCHECK_PORT = int(os.environ.get("TRACKER_HEALTHCHECK_PORT", "8080"))
+READYZ_TIMEOUT = 0.5
+
+# compose project name -> published (host, port) of the tracker healthcheck;
+# projects are unique per fixture and the tracker is not restarted within one
+healthcheck_address_cache = {}
+
+# (compose project name, container port) -> published broker (host, port);
+# call reset_broker_host_cache() after the broker is started again
+broker_host_cache = {}
+
+# Probes go straight to localhost; ignore proxy settings from the environment
+http = requests.Session()
+http.trust_env = False
+
 
 def is_tracker_ready(docker):
   """Check if tracker /readyz endpoint returns healthy."""
+  address = get_healthcheck_address(docker)
+  if address is None:
+    return False
+  host, port = address
   try:
-    result = docker.compose.execute(
-        "tracker",
-        ["/scenescape/tracker", "healthcheck", "--endpoint", "/readyz"],
-        tty=False
-    )
-    return "OK" in result or result.strip() == ""
-  except Exception:
+    return http.get(f"http://{host}:{port}/readyz", timeout=READYZ_TIMEOUT).status_code == 200
+  except requests.RequestException:
     return False
 
 
+def follow_logs_for(docker, service, needle, since, until):
+  """
+  Follow service logs from since in a background thread.
+
+  The stream is bounded by until, so the 'compose logs --follow' process
+  exits by then even if needle never appears; closing the stream
+  iterator early would not stop it.
+
+  Returns an Event that is set once a log line contains needle, or when
+  the log stream ends or fails so that callers fall back to probing.
+  """
+  found = threading.Event()
+
+  def follow():
+    try:
+      for _, line in docker.compose.logs(service, follow=True, stream=True,
+                                         since=since, until=until):
+        if needle in line:
+          break
+    finally:
+      found.set()
+
+  threading.Thread(target=follow, daemon=True).start()
+  return found
+
+
 def wait_for_readiness(docker, timeout=DEFAULT_TIMEOUT):
-  """Wait until tracker /readyz returns 200."""
-  wait(lambda: is_tracker_ready(docker), timeout_seconds=timeout, sleep_seconds=POLL_INTERVAL)
+  """
+  Wait until tracker /readyz returns 200.
+
+  Instead of probing every poll interval, probe once up front, follow
+  the tracker log and probe again after the subscription line appears.
+  """
+  deadline = time.monotonic() + timeout
+  now = time.time()
+  since = f"{now - READY_LOG_LOOKBACK:.3f}"
+  until = f"{now + timeout:.3f}"
+  if is_tracker_ready(docker):
+    return
+
+  subscribed = follow_logs_for(docker, "tracker", READY_LOG_LINE, since, until)
+  subscribed.wait(timeout)
+  remaining = max(deadline - time.monotonic(), POLL_INTERVAL)
+  wait(lambda: is_tracker_ready(docker), timeout_seconds=remaining, sleep_seconds=POLL_INTERVAL)
+
+
+def find_service_container(docker, service):
+  """Get the compose container for a service, or None if it does not exist."""
+  containers = docker.compose.ps(services=[service])
+  return containers[0] if containers else None
+
+
+def get_published_port(docker, service, port):
+  """
+  Get the host address a service's container port is published on.
+
+  Not cached; docker may publish a different host port after the
+  service is stopped and started again.
+
+  Returns:
+      (host, port) tuple, or None if the port is not published (yet)
+  """
+  container = find_service_container(docker, service)
+  if container is not None:
+    ports = container.network_settings.ports
+    port_key = f"{port}/tcp"
+    if port_key in ports and ports[port_key]:
+      return ("localhost", int(ports[port_key][0]["HostPort"]))
+  return None
+
+
+def get_healthcheck_address(docker):
+  """
+  Get the published address of the tracker healthcheck port.
+
+  Cached per compose project, since is_tracker_ready probes it repeatedly.
+
+  Returns:
+      (host, port) tuple, or None if the port is not published (yet)
+  """
+  key = docker.client_config.compose_project_name
+  if key not in healthcheck_address_cache:
+    address = get_published_port(docker, "tracker", HEALTHCHECK_PORT)
+    if address is None:
+      return None
+    healthcheck_address_cache[key] = address
+  return healthcheck_address_cache[key]
+
+
+def wait_for_health_event(docker, service="tracker", timeout=DEFAULT_TIMEOUT):
+  """
+  Wait until the service container healthcheck reports healthy.
+
+  Blocks on docker health_status events instead of polling. The event
+  stream starts from the time of the call, so a transition that happens
+  between the state check and the subscription is still delivered.
+
+  Docker only emits health_status on transitions, so this detects the
+  first healthy state after startup. Use wait_for_readiness for
+  reconnects where the healthcheck never reported unhealthy.
+  """
+  start = datetime.now()
+  container = find_service_container(docker, service)
+  if container is None:
+    raise TimeoutExpired(timeout, f"{service} container")
+
+  health = docker.container.inspect(container.id).state.health
+  if health is not None and health.status == "healthy":
+    return
+
+  events = docker.system.events(
+      since=start,
+      until=start + timedelta(seconds=timeout),
+      filters={"container": container.id, "event": "health_status"},
+  )
+  for event in events:
+    if event.action.endswith(": healthy"):
+      return
+  raise TimeoutExpired(timeout, f"{service} health_status: healthy")
 
 
 def get_broker_host(docker, port=1883):
-  """Get broker hostname accessible from test host."""
-  containers = docker.compose.ps()
-  for container in containers:
-    if "-broker-" in container.name:
-      ports = container.network_settings.ports
-      port_key = f"{port}/tcp"
-      if port_key in ports and ports[port_key]:
-        return "localhost", int(ports[port_key][0]["HostPort"])
-  return "localhost", port
+  """
+  Get broker hostname accessible from test host.
+
+  Cached per compose project and port, so repeated lookups skip the
+  'compose ps' round-trip. Only published ports are cached.
+  """
+  key = (docker.client_config.compose_project_name, port)
+  if key not in broker_host_cache:
+    address = get_published_port(docker, "broker", port)
+    if address is None:
+      return ("localhost", port)
+    broker_host_cache[key] = address
+  return broker_host_cache[key]
+
+
+def reset_broker_host_cache():
+  """Forget cached broker addresses, e.g. after the broker was started again."""
+  broker_host_cache.clear()
 
 
 def get_container_logs(docker, service):
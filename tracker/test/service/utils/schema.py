@@ -10,11 +10,13 @@ Validates messages against the actual schema files in schema/ directory
 to catch schema drift between tests and production.
 """
 
-import json
 from functools import lru_cache
 from pathlib import Path
 
-from jsonschema import validate, ValidationError
+import orjson
+from jsonschema import ValidationError
+from jsonschema.exceptions import best_match
+from jsonschema.validators import validator_for
 
 
 # Path to schema directory (relative to this file)
@@ -36,8 +38,37 @@ def load_schema(schema_name: str) -> dict:
   if not schema_path.exists():
     raise FileNotFoundError(f"Schema not found: {schema_path}")
 
-  with open(schema_path) as f:
-    return json.load(f)
+  return orjson.loads(schema_path.read_bytes())
+
+
+def build_validator(schema_name: str):
+  """
+  Build a reusable validator for a JSON schema file.
+
+  jsonschema.validate() checks the schema and builds a new validator on
+  every call; validators built here are created once and reused.
+
+  Args:
+    schema_name: Schema filename (e.g., "camera-data.schema.json")
+
+  Returns:
+    jsonschema validator instance for the schema's declared draft
+  """
+  schema = load_schema(schema_name)
+  validator_class = validator_for(schema)
+  validator_class.check_schema(schema)
+  return validator_class(schema)
+
+
+def check(validator, data: dict) -> None:
+  """Raise the most relevant validation error, as jsonschema.validate() does."""
+  error = best_match(validator.iter_errors(data))
+  if error is not None:
+    raise error
+
+
+CAMERA_VALIDATOR = build_validator("camera-data.schema.json")
+SCENE_VALIDATOR = build_validator("scene-data.schema.json")
 
 
 def validate_camera_input(data: dict) -> None:
@@ -51,9 +82,8 @@ def validate_camera_input(data: dict) -> None:
     jsonschema.ValidationError: If validation fails
     AssertionError: With friendly message on validation failure
   """
-  schema = load_schema("camera-data.schema.json")
   try:
-    validate(instance=data, schema=schema)
+    check(CAMERA_VALIDATOR, data)
   except ValidationError as e:
     raise AssertionError(f"Camera input validation failed: {e.message}") from e
 
@@ -69,8 +99,7 @@ def validate_scene_output(data: dict) -> None:
     jsonschema.ValidationError: If validation fails
     AssertionError: With friendly message on validation failure
   """
-  schema = load_schema("scene-data.schema.json")
   try:
-    validate(instance=data, schema=schema)
+    check(SCENE_VALIDATOR, data)
   except ValidationError as e:
     raise AssertionError(f"Scene output validation failed: {e.message}") from e